@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures the engine with synthetic configurations, outside of a box (see standins)
+	every case runs in an own process, so the peak-memory (ru_maxrss) belongs to the case only
+	the time is the best of the repeats, the memory and the objects are the ones of the first run
+	objects is the growth of the objects tracked by the garbage-collector, while the case runs
+
+	python benchmarks/bench_engine.py [--sizes 100,1000,10000,100000,1000000] [--cases readXml,writeXml]
+		[--repeat 3] [--output results.json] [--baseline baseline.json] [--threshold 0.2]
+
+	with --baseline the results are compared to a stored output, the script exits with 1,
+	if the time or the memory of a case grew more than the threshold
+"""
+import gc
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+from time import time, strftime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import standins
+standins.install()
+
+from Plugins.SystemPlugins.xmlConfigTool.XMLConfigSupport import XMLConfigSupport
+from Plugins.SystemPlugins.xmlConfigTool.ConfigScreens import ConfigObjecSelect
+from Tools.XMLTools import stringToXML
+from xml.etree.cElementTree import parse as cet_parse
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+# differences below are measurement noise, even if they exceed the threshold
+MIN_TIME = 0.02
+MIN_MEMORY = 1024
+
+class Entry:
+	def __init__(self):
+		self.key = ""
+		self.name = ""
+		self.enabled = True
+		self.value = 0
+		self.description = ""
+
+"""
+implemented like in the plugins, with parseEntry and getXml
+"""
+class EntrySupport(XMLConfigSupport):
+	def __init__(self, xmlFile):
+		XMLConfigSupport.__init__(self, xmlFile, "entry", Entry, supportName = "bench")
+
+	def parseEntry(self, element):
+		object = Entry()
+		object.key = element.get("key", "")
+		object.name = element.get("name", "")
+		object.enabled = self._xml2Bool(element, "enabled", "yes")
+		try:
+			object.value = int(element.get("value", "0"))
+		except ValueError:
+			pass
+		object.description = element.get("description", "")
+		return object
+
+	def getXml(self, objectList):
+		xml = ["<?xml version=\"1.0\" ?>\n<entries>\n"]
+		for object in objectList:
+			xml.append("\t<entry key=\"%s\" name=\"%s\" enabled=\"%s\" value=\"%d\" description=\"%s\" />\n" \
+				% (stringToXML(object.key), stringToXML(object.name), self._bool2Xml(object.enabled), \
+				object.value, stringToXML(object.description)))
+		xml.append("</entries>\n")
+		return xml
+
+"""
+writes a configuration with count entries, every 7th is disabled, the names aren't sorted
+	offset and changeEvery create an import, which overlaps the standard file and changes some of its entries
+"""
+def generateConfig(xmlFile, count, offset = 0, changeEvery = 0):
+	out = open(xmlFile, "w")
+	out.write("<?xml version=\"1.0\" ?>\n<entries>\n")
+	for i in xrange(offset, offset + count):
+		value = i * 7 % 1000
+		if changeEvery and i % changeEvery == 0:
+			value += 1
+		out.write("\t<entry key=\"key%d\" name=\"Entry %d &amp; more\" enabled=\"%s\" value=\"%d\" description=\"Synthetic entry number %d\" />\n" \
+			% (i, i * 7919 % count, "no" if i % 7 == 0 else "yes", value, i))
+	out.write("</entries>\n")
+	out.close()
+
+def loadSupport(context):
+	support = EntrySupport(context["configFile"])
+	support.readXml()
+	return support
+
+# every case prepares the run and returns the measured function
+
+def caseReadXml(context):
+	support = EntrySupport(context["configFile"])
+	return support.readXml
+
+def caseParseConfig(context):
+	support = EntrySupport(context["configFile"])
+	configuration = cet_parse(context["configFile"]).getroot()
+	objectList = []
+	return lambda: support.parseConfig(configuration, objectList)
+
+def caseWriteConfigToRam(context):
+	support = EntrySupport(context["configFile"])
+	objectList = []
+	support.parseConfig(cet_parse(context["configFile"]).getroot(), objectList)
+	return lambda: support.writeConfigToRam(objectList)
+
+def caseWriteXml(context):
+	support = loadSupport(context)
+	outFile = os.path.join(context["workDir"], "written.xml")
+	return lambda: support.writeXml(outFile)
+
+def caseGetSortedTupleList(context):
+	support = loadSupport(context)
+	return support.getSortedTupleList
+
+"""
+full reload of the changed file, while the overview has created the sorted view "name"
+"""
+def caseReloadSortedView(context):
+	support = loadSupport(context)
+	support.getSortedView("name")
+	def reload():
+		support.invalidateXML()
+		return support.readXml()
+	return reload
+
+"""
+like ConfigObjectOverview.importConfigFinal, the existing entries are kept and the changed ones are overwritten
+"""
+def caseImportMerge(context):
+	support = loadSupport(context)
+	importObjects = []
+	support.readXml(importObjects, context["importFile"], writeToRam = False)
+	def importMerge():
+		diff = support.diffObjects(importObjects)
+		return support.writeConfigToRam(diff["added"] + diff["changed"], overwriteExisting = True)
+	return importMerge
+
+"""
+the list of the selection-screen, the screen is created without session and skin
+"""
+def caseSetSelection(context):
+	support = loadSupport(context)
+	objects = support.getObjectList()
+	screen = ConfigObjecSelect.__new__(ConfigObjecSelect)
+	standins.Screen.__init__(screen)
+	screen.sortedObjects = sorted(objects, key = lambda object: object.name.lower())
+	screen.selectedObjects = dict([(object.key, object) for object in objects[::2]])
+	screen.showDisabled = False
+	screen["list"] = standins.SelectionList()
+	return screen.setSelection
+
+CASES = [
+	("readXml", caseReadXml),
+	("parseConfig", caseParseConfig),
+	("writeConfigToRam", caseWriteConfigToRam),
+	("writeXml", caseWriteXml),
+	("getSortedTupleList", caseGetSortedTupleList),
+	("reloadSortedView", caseReloadSortedView),
+	("importMerge", caseImportMerge),
+	("setSelection", caseSetSelection),
+]
+
+def measureCase(caseFunc, context, repeat):
+	times = []
+	memory = objects = 0
+	for i in range(repeat):
+		func = caseFunc(context)
+		gc.collect()
+		objectsBefore = len(gc.get_objects())
+		memoryBefore = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		startTime = time()
+		result = func()
+		times.append(time() - startTime)
+		if i == 0:
+			memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - memoryBefore
+			objects = len(gc.get_objects()) - objectsBefore
+		del func, result
+	return {"time": min(times), "peakMemoryKB": memory, "objects": objects}
+
+"""
+runs the case in a child-process and returns its result
+"""
+def runCase(caseFunc, context, repeat):
+	readFd, writeFd = os.pipe()
+	pid = os.fork()
+	if pid == 0:
+		os.close(readFd)
+		status = 0
+		try:
+			result = measureCase(caseFunc, context, repeat)
+		except:
+			from traceback import format_exc
+			result = {"error": format_exc()}
+			status = 1
+		os.write(writeFd, json.dumps(result))
+		os.close(writeFd)
+		os._exit(status)
+	os.close(writeFd)
+	data = []
+	while True:
+		chunk = os.read(readFd, 65536)
+		if not chunk:
+			break
+		data.append(chunk)
+	os.close(readFd)
+	os.waitpid(pid, 0)
+	return json.loads("".join(data))
+
+def runAll(sizes, caseNames, repeat):
+	results = {}
+	workDir = tempfile.mkdtemp(prefix = "bench_engine_")
+	try:
+		for size in sizes:
+			context = {"workDir": workDir, "configFile": os.path.join(workDir, "config_%d.xml" % (size)), \
+				"importFile": os.path.join(workDir, "import_%d.xml" % (size))}
+			generateConfig(context["configFile"], size)
+			# half of the import is new, every 10th of the existing entries is changed
+			generateConfig(context["importFile"], size, offset = size / 2, changeEvery = 10)
+			for name, caseFunc in CASES:
+				if caseNames and not name in caseNames:
+					continue
+				result = runCase(caseFunc, context, repeat if size < 1000000 else 1)
+				results["%s/%d" % (name, size)] = result
+				if result.has_key("error"):
+					print "%-20s %8d  ERROR\n%s" % (name, size, result["error"])
+				else:
+					print "%-20s %8d  %10.4fs %10d KB %10d objects" \
+						% (name, size, result["time"], result["peakMemoryKB"], result["objects"])
+				sys.stdout.flush()
+			os.remove(context["configFile"])
+			os.remove(context["importFile"])
+	finally:
+		shutil.rmtree(workDir, True)
+	return results
+
+"""
+returns the list of the regressions of the results against the baseline
+"""
+def compareBaseline(results, baseline, threshold):
+	regressions = []
+	for key in sorted(results):
+		current = results[key]
+		previous = baseline.get("results", {}).get(key)
+		if previous == None or current.has_key("error") or previous.has_key("error"):
+			continue
+		for metric, minimum in (("time", MIN_TIME), ("peakMemoryKB", MIN_MEMORY)):
+			if current[metric] - previous[metric] > max(previous[metric] * threshold, minimum):
+				regressions.append("%s %s: %s -> %s (+%.0f%%)" % (key, metric, previous[metric], current[metric], \
+					100.0 * (current[metric] - previous[metric]) / max(previous[metric], 1e-9)))
+	return regressions
+
+def main(argv):
+	sizes = DEFAULT_SIZES
+	caseNames = None
+	repeat = 3
+	output = None
+	baselineFile = None
+	threshold = 0.2
+	i = 0
+	while i < len(argv):
+		option = argv[i]
+		value = argv[i + 1] if i + 1 < len(argv) else None
+		if option == "--sizes":
+			sizes = [int(size) for size in value.split(",")]
+		elif option == "--cases":
+			caseNames = value.split(",")
+		elif option == "--repeat":
+			repeat = int(value)
+		elif option == "--output":
+			output = value
+		elif option == "--baseline":
+			baselineFile = value
+		elif option == "--threshold":
+			threshold = float(value)
+		else:
+			print __doc__
+			return 2
+		i += 2
+
+	results = runAll(sizes, caseNames, repeat)
+	document = {"created": strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(), \
+		"platform": platform.platform(), "sizes": sizes, "repeat": repeat, "results": results}
+	if output != None:
+		out = open(output, "w")
+		json.dump(document, out, indent = 1, sort_keys = True)
+		out.close()
+
+	status = 1 if [result for result in results.itervalues() if result.has_key("error")] else 0
+	if baselineFile != None:
+		baseline = json.load(open(baselineFile))
+		regressions = compareBaseline(results, baseline, threshold)
+		if regressions:
+			print "\n%d regressions against %s (threshold %.0f%%):" % (len(regressions), baselineFile, threshold * 100)
+			for regression in regressions:
+				print "\t" + regression
+			status = 1
+		else:
+			print "\nNo regressions against %s (threshold %.0f%%)." % (baselineFile, threshold * 100)
+	return status
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures the import of the storage-core and of the screens, and checks that the core
+doesn't import any module of enigma except the General-Logger
+	every import runs in a new process, the stand-ins are imported on demand (standins.install(lazy = True)),
+	so the list shows which modules of enigma an import needs
+
+	python benchmarks/bench_import.py [runs]
+
+	exits with 1, if the core imports other modules of enigma
+"""
+import json
+import os
+import sys
+from time import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import standins
+
+PACKAGE = standins.PACKAGE
+# modules for load and save, without the screens
+CORE_MODULES = ["XMLConfigTools", "XMLConfigSupport", "XMLConfigObject", "XMLConfigSchema", "XMLConfigRegistry", \
+	"XMLConfigMetrics"]
+UI_MODULES = ["ConfigScreens", "XMLConfigFileDialog"]
+ALLOWED_STANDINS = ["Plugins.SystemPlugins.GeneralLogger", "Plugins.SystemPlugins.GeneralLogger.GeneralLogger"]
+
+"""
+imports the modules in a new process, returns the duration and the imported stand-ins
+"""
+def measureImport(modules):
+	readFd, writeFd = os.pipe()
+	pid = os.fork()
+	if pid == 0:
+		os.close(readFd)
+		standins.install(lazy = True)
+		startTime = time()
+		for module in modules:
+			__import__("%s.%s" % (PACKAGE, module))
+		importTime = time() - startTime
+		os.write(writeFd, json.dumps([importTime, standins.importedStandins]))
+		os.close(writeFd)
+		os._exit(0)
+	os.close(writeFd)
+	data = []
+	while True:
+		chunk = os.read(readFd, 65536)
+		if not chunk:
+			break
+		data.append(chunk)
+	os.close(readFd)
+	os.waitpid(pid, 0)
+	return json.loads("".join(data))
+
+def median(values):
+	values = sorted(values)
+	return values[len(values) / 2]
+
+def main(runs):
+	status = 0
+	# the first import compiles the modules
+	measureImport(CORE_MODULES + UI_MODULES)
+	for name, modules in (("core", CORE_MODULES), ("core and screens", CORE_MODULES + UI_MODULES)):
+		results = [measureImport(modules) for i in range(runs)]
+		importedStandins = sorted(results[0][1])
+		print "%-18s %8.3f ms, %2d modules of enigma: %s" % (name, median([result[0] for result in results]) * 1000.0, \
+			len(importedStandins), ", ".join(importedStandins))
+		if name == "core":
+			forbidden = [module for module in importedStandins if not module in ALLOWED_STANDINS]
+			if forbidden:
+				print "ERROR: the core imports %s" % (", ".join(forbidden))
+				status = 1
+			else:
+				print "OK: the core imports only the General-Logger"
+	return status
+
+if __name__ == "__main__":
+	sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 11))
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures what the level-check of the logging-facade (XMLConfigTools.setLogLevel) saves in the hot paths
+	the General-Logger drops the debug-messages in both runs, like on a box in normal operation,
+	without the facade-level they are formatted before
+
+	python benchmarks/bench_logging.py [count]
+"""
+import os
+import sys
+import tempfile
+from time import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import standins
+standins.install()
+
+from Plugins.SystemPlugins.xmlConfigTool.XMLConfigTools import ERROR_LEVEL, WARN_LEVEL, DEBUG_LEVEL, \
+	getGeneralLogger, setLogLevel
+from bench_engine import EntrySupport, Entry, generateConfig
+
+"""
+returns the best time of three runs per call in microseconds
+"""
+def measure(func, count):
+	times = []
+	for run in range(3):
+		startTime = time()
+		func(count)
+		times.append(time() - startTime)
+	return min(times) * 1000000.0 / count
+
+def eagerMessages(count):
+	log = getGeneralLogger("bench")
+	xmlFile = "/etc/enigma2/bench.xml"
+	for i in xrange(count):
+		log.printOut("Read from configuration file: %s" % (str(xmlFile)), level = DEBUG_LEVEL)
+		log.printOut("%d Entries parsed, %d Entries loaded in %.3fs!" % (i, i, 0.5), level = DEBUG_LEVEL)
+
+def lazyMessages(count):
+	log = getGeneralLogger("bench")
+	xmlFile = "/etc/enigma2/bench.xml"
+	for i in xrange(count):
+		log.printOut("Read from configuration file: %s", xmlFile, level = DEBUG_LEVEL)
+		log.printOut("%d Entries parsed, %d Entries loaded in %.3fs!", i, i, 0.5, level = DEBUG_LEVEL)
+
+def main(count):
+	workDir = tempfile.mkdtemp(prefix = "bench_logging_")
+	xmlFile = os.path.join(workDir, "config.xml")
+	generateConfig(xmlFile, 10)
+	support = EntrySupport(xmlFile)
+	support.readXml()
+	objects = support.getObjectList()
+
+	# readXml of the unchanged file is called before every access to the objects
+	def unchangedRead(count):
+		for i in xrange(count):
+			support.readXml()
+
+	def smallLoads(count):
+		for i in xrange(count):
+			support.writeConfigToRam(objects, True)
+
+	def diffs(count):
+		for i in xrange(count):
+			support.diffObjects(objects[:1])
+
+	cases = [
+		("message eager", eagerMessages),
+		("message lazy", lazyMessages),
+		("readXml unchanged", unchangedRead),
+		("writeConfigToRam 10", smallLoads),
+		("diffObjects", diffs),
+	]
+	print "%-24s %14s %14s %8s" % ("case", "debug us/call", "warn us/call", "saved")
+	for name, func in cases:
+		setLogLevel(DEBUG_LEVEL)
+		debugTime = measure(func, count)
+		setLogLevel(WARN_LEVEL)
+		warnTime = measure(func, count)
+		print "%-24s %14.2f %14.2f %7.0f%%" % (name, debugTime, warnTime, 100.0 * (debugTime - warnTime) / debugTime)
+	setLogLevel(None)
+	os.remove(xmlFile)
+	os.rmdir(workDir)
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
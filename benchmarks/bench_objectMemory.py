@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares the memory of objects based on XMLConfigObject (__slots__) with a plain class (__dict__)
+	every variant is created in an own child-process, the growth of its max. RSS is measured
+
+	python benchmarks/bench_objectMemory.py [count]
+"""
+import os
+import resource
+import sys
+from time import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from XMLConfigObject import XMLConfigObject
+
+class DictObject:
+	def __init__(self):
+		self.key = ""
+		self.name = ""
+		self.enabled = True
+		self.begin = 0
+		self.end = 0
+		self.channel = ""
+		self.description = ""
+
+	def copy(self):
+		object = DictObject()
+		object.__dict__.update(self.__dict__)
+		return object
+
+class SlotObject(XMLConfigObject):
+	fields = (("begin", 0), ("end", 0), ("channel", ""), ("description", ""))
+
+def createObjects(objectClass, count):
+	objects = {}
+	for i in xrange(count):
+		object = objectClass()
+		object.key = str(i)
+		object.name = "Entry %d" % (i)
+		object.enabled = i % 2 == 0
+		object.begin = i * 60
+		object.end = i * 60 + 30
+		object.channel = "Channel %d" % (i % 100)
+		object.description = "Description %d" % (i)
+		objects[object.key] = object
+	return objects
+
+def getObjectSize(object):
+	size = sys.getsizeof(object)
+	if hasattr(object, "__dict__"):
+		size += sys.getsizeof(object.__dict__)
+	return size
+
+def measure(objectClass, count):
+	readPipe, writePipe = os.pipe()
+	pid = os.fork()
+	if pid == 0:
+		os.close(readPipe)
+		rssBefore = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		startTime = time()
+		objects = createObjects(objectClass, count)
+		createTime = time() - startTime
+		rssAfter = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		startTime = time()
+		for object in objects.itervalues():
+			object.copy()
+		copyTime = time() - startTime
+		os.write(writePipe, "%d %f %f %d" % (rssAfter - rssBefore, createTime, copyTime, \
+			getObjectSize(objects["0"])))
+		os._exit(0)
+	os.close(writePipe)
+	result = os.read(readPipe, 1024).split()
+	os.close(readPipe)
+	os.waitpid(pid, 0)
+	return int(result[0]), float(result[1]), float(result[2]), int(result[3])
+
+if __name__ == "__main__":
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+	print "%d objects with 7 attributes" % (count)
+	print "%-12s %12s %14s %10s %10s" % ("class", "RSS [kB]", "object [Byte]", "create [s]", "copy [s]")
+	results = {}
+	for objectClass in (DictObject, SlotObject):
+		rss, createTime, copyTime, objectSize = measure(objectClass, count)
+		results[objectClass] = rss
+		print "%-12s %12d %14d %10.3f %10.3f" % (objectClass.__name__, rss, objectSize, createTime, copyTime)
+	if results[DictObject] > 0:
+		print "__slots__ saves %.1f%% RSS" % (100.0 - 100.0 * results[SlotObject] / results[DictObject])
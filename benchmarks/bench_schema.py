@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares the per-entry cost of parsing and formatting with a compiled XMLConfigSchema
+against hand-written functions, like they are implemented in the plugins
+
+	python benchmarks/bench_schema.py [count]
+"""
+import os
+import sys
+from time import time
+from xml.etree.cElementTree import fromstring
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from XMLConfigSerializer import escapeXml
+from XMLConfigObject import XMLConfigObject
+from XMLConfigSchema import XMLConfigSchema, XMLConfigField, XMLConfigIntCodec, XMLConfigBoolCodec, \
+	XMLConfigEnumCodec, XMLConfigListCodec
+
+class Timer(XMLConfigObject):
+	fields = (("begin", 0), ("end", 0), ("type", "record"), ("services", []))
+
+FIELDS = [
+	XMLConfigField("key"),
+	XMLConfigField("name"),
+	XMLConfigField("enabled", XMLConfigBoolCodec()),
+	XMLConfigField("begin", XMLConfigIntCodec()),
+	XMLConfigField("end", XMLConfigIntCodec()),
+	XMLConfigField("type", XMLConfigEnumCodec(["record", "zap", "standby"])),
+	XMLConfigField("services", XMLConfigListCodec(XMLConfigIntCodec())),
+]
+
+"""
+hand-written like in the plugins, with _xml2Bool and _bool2Xml of XMLConfigSupport
+"""
+class HandWritten:
+	xmlBool = {"TRUE": "yes", "FALSE": "no"}
+
+	def _xml2Bool(self, element, xmlAttr, default):
+		xmlEnabled = element.get(xmlAttr, default)
+		if xmlEnabled == self.xmlBool["FALSE"]:
+			enabled = False
+		elif xmlEnabled == self.xmlBool["TRUE"]:
+			enabled = True
+		else:
+			enabled = False
+		return enabled
+
+	def _bool2Xml(self, bool):
+		if bool:
+			return self.xmlBool["TRUE"]
+		else:
+			return self.xmlBool["FALSE"]
+
+	def parseEntry(self, element):
+		object = Timer()
+		object.key = element.get("key", "")
+		object.name = element.get("name", "")
+		object.enabled = self._xml2Bool(element, "enabled", "yes")
+		try:
+			object.begin = int(element.get("begin", "0"))
+			object.end = int(element.get("end", "0"))
+		except ValueError:
+			pass
+		type = element.get("type", "record")
+		if type in ("record", "zap", "standby"):
+			object.type = type
+		object.services = [int(service) for service in element.get("services", "").split(",") if service]
+		return object
+
+	def formatEntry(self, object):
+		return "\t<timer key=\"%s\" name=\"%s\" enabled=\"%s\" begin=\"%d\" end=\"%d\" type=\"%s\" services=\"%s\" />\n" \
+			% (escapeXml(object.key), escapeXml(object.name), self._bool2Xml(object.enabled), object.begin, \
+			object.end, object.type, ",".join([str(service) for service in object.services]))
+
+"""
+returns the best time of three runs per item in microseconds
+"""
+def measure(func, items):
+	times = []
+	for run in range(3):
+		startTime = time()
+		for item in items:
+			func(item)
+		times.append(time() - startTime)
+	return min(times) / len(items) * 1000000
+
+if __name__ == "__main__":
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+	elements = [fromstring("<timer key=\"%d\" name=\"Timer &amp; %d\" enabled=\"%s\" begin=\"%d\" end=\"%d\" type=\"zap\" services=\"1,2,%d\" />" \
+		% (i, i, "yes" if i % 2 else "no", i * 60, i * 60 + 30, i)) for i in xrange(count)]
+
+	handWritten = HandWritten()
+	startTime = time()
+	schema = XMLConfigSchema("timer", FIELDS, Timer, ("yes", "no"), lambda xmlAttr, value, default: default)
+	compileTime = time() - startTime
+
+	objects = [handWritten.parseEntry(element) for element in elements]
+	assert [handWritten.formatEntry(object) for object in objects[:100]] \
+		== [schema.format(schema.parse(element)) for element in elements[:100]]
+	# cElementTree returns non-ascii values as unicode, they are written as utf-8 and read back unchanged
+	element = fromstring("<timer key=\"\xc3\xa4\" name=\"M\xc3\xbcll &amp; Stra\xc3\x9fe\" type=\"zap\" services=\"1\" />")
+	line = schema.format(schema.parse(element))
+	assert isinstance(line, str) and schema.parse(fromstring(line)).toDict() == schema.parse(element).toDict()
+
+	print "%d entries, schema compiled in %.3fms" % (count, compileTime * 1000)
+	print "%-12s %12s %12s" % ("", "parse [us]", "format [us]")
+	for name, parseFunc, formatFunc in (("hand-written", handWritten.parseEntry, handWritten.formatEntry), \
+			("schema", schema.parse, schema.format)):
+		print "%-12s %12.2f %12.2f" % (name, measure(parseFunc, elements), measure(formatFunc, objects))
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures the import of plugin.py at the start of enigma, with the help registered lazily,
+against the former start, which parsed and registered mphelp.xml while importing
+	every measurement runs in a new process, so nothing is imported before,
+	the former start is measured by a variant process, which registers the help while importing plugin.py,
+	the processes of both variants alternate, so a drift of the machine affects both
+	the MPHelp stand-in parses the help-file like the XMLHelpReader, the import of MPHelp itself isn't contained
+
+	python benchmarks/bench_startup.py [runs]
+"""
+import os
+import sys
+from time import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import standins
+standins.install()
+
+"""
+returns the durations of the import of plugin.py and of the first registration of the help in a new process
+	[eager]:	the help is registered at the import like the former plugin.py, the duration of the import contains it
+"""
+def measureStart(eager = False):
+	readFd, writeFd = os.pipe()
+	pid = os.fork()
+	if pid == 0:
+		os.close(readFd)
+		startTime = time()
+		from Plugins.SystemPlugins.xmlConfigTool import plugin
+		if eager:
+			plugin.XMLConfigMainHelp.getHelp()
+		importTime = time() - startTime
+		startTime = time()
+		plugin.XMLConfigMainHelp.getHelp()
+		helpTime = time() - startTime
+		os.write(writeFd, "%r %r %d" % (importTime, helpTime, len(standins.registeredHelp)))
+		os.close(writeFd)
+		os._exit(0)
+	os.close(writeFd)
+	data = os.read(readFd, 1024)
+	os.close(readFd)
+	os.waitpid(pid, 0)
+	importTime, helpTime, registered = data.split()
+	if int(registered) != 1:
+		raise RuntimeError("help wasn't registered")
+	return float(importTime), float(helpTime)
+
+def median(values):
+	values = sorted(values)
+	return values[len(values) / 2]
+
+def main(runs):
+	results = []
+	eagerResults = []
+	for i in range(runs):
+		results.append(measureStart())
+		eagerResults.append(measureStart(eager = True))
+	importTime = median([result[0] for result in results]) * 1000.0
+	helpTime = median([result[1] for result in results]) * 1000.0
+	eagerImportTime = median([result[0] for result in eagerResults]) * 1000.0
+	print "import of plugin.py (lazy help):      %8.3f ms" % (importTime)
+	print "first showMainHelp (parse, register):  %8.3f ms" % (helpTime)
+	print "import with eager help (before):       %8.3f ms" % (eagerImportTime)
+	print "saved at every start:                  %8.3f ms (%.0f%%)" \
+		% (eagerImportTime - importTime, 100.0 * (eagerImportTime - importTime) / eagerImportTime)
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 21)
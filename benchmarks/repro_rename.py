@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+"""
+Reproduces the rename of an object in the editor (addObject with overwrite)
+	the editor changes the object in place, so it has the new key already, when _editorCallback is called
+	afterwards neither the objects in ram, nor the sorted view, nor the xml-file may contain the old key
+	or the renamed object twice, it runs with and without the journal
+
+	python benchmarks/repro_rename.py
+
+	exits with 1, if the old key is left
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import standins
+standins.install()
+
+from bench_engine import EntrySupport, generateConfig
+
+"""
+renames key1 like the editor and returns the errors
+"""
+def renameEntry(xmlFile, journal):
+	generateConfig(xmlFile, 4)
+	support = EntrySupport(xmlFile)
+	support.adjustJournal(journal)
+	support.readXml()
+	view = support.getSortedView("name")
+
+	object = support.get("key1")
+	oldKey = object.key
+	object.key = "renamed"
+	support._editorCallback(None, True, True, oldKey, object)
+
+	errors = []
+	expected = ["key0", "key2", "key3", "renamed"]
+	ramKeys = sorted(support.objects.keys())
+	if ramKeys != expected:
+		errors.append("keys in ram: %s" % (ramKeys))
+	viewKeys = sorted([object.key for object in view])
+	if viewKeys != expected:
+		errors.append("keys of the sorted view: %s" % (viewKeys))
+	reader = EntrySupport(xmlFile)
+	reader.adjustJournal(journal)
+	# the journal is replayed only while reading the standard-file into ram
+	reader.readXml()
+	objectList = reader.getObjectList()
+	fileKeys = sorted([object.key for object in objectList])
+	if fileKeys != expected:
+		errors.append("keys in the xml-file: %s" % (fileKeys))
+	return errors
+
+def main():
+	workDir = tempfile.mkdtemp(prefix = "repro_rename_")
+	status = 0
+	try:
+		for journal in (False, True):
+			errors = renameEntry(os.path.join(workDir, "config_%d.xml" % (journal)), journal)
+			print "%-16s %s" % ("journal" if journal else "standard", "ERROR" if errors else "OK")
+			for error in errors:
+				print "\t" + error
+				status = 1
+	finally:
+		shutil.rmtree(workDir, True)
+	return status
+
+if __name__ == "__main__":
+	sys.exit(main())
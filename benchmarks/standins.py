@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+"""
+Lightweight stand-ins for the enigma-modules, which are imported by the plugin,
+so the engine can be imported and measured outside of a box
+
+	import standins
+	standins.install()
+	from Plugins.SystemPlugins.xmlConfigTool.XMLConfigSupport import XMLConfigSupport
+"""
+import os
+import sys
+import types
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+PACKAGE = "Plugins.SystemPlugins.xmlConfigTool"
+
+ERROR_LEVEL = 0
+WARN_LEVEL = 1
+DEBUG_LEVEL = 2
+
+# messages with a higher level are dropped
+logLevel = ERROR_LEVEL
+
+class OutLogger:
+	def __init__(self, prefix = "", inPluginVersion = ""):
+		self.prefix = prefix
+
+	def printOut(self, text, level = DEBUG_LEVEL):
+		if level <= logLevel:
+			sys.stderr.write("[%s] %d %s\n" % (self.prefix, level, text))
+
+def stringToXML(text):
+	return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace("\"", "&quot;").replace("'", "&apos;")
+
+class boundFunction:
+	def __init__(self, fnc, *args, **kwargs):
+		self.fnc = fnc
+		self.args = args
+		self.kwargs = kwargs
+
+	def __call__(self, *args, **kwargs):
+		newkwargs = self.kwargs.copy()
+		newkwargs.update(kwargs)
+		return self.fnc(*self.args + args, **newkwargs)
+
+class Dummy(object):
+	def __init__(self, *args, **kwargs):
+		pass
+
+	def __call__(self, *args, **kwargs):
+		return Dummy()
+
+	def __getattr__(self, name):
+		return Dummy()
+
+"""
+base of the stand-ins for the classes of screens and components, every name gets its own class,
+so they can be combined as base-classes (e.g. Screen and HelpableScreen)
+"""
+class Standin(object):
+	def __init__(self, *args, **kwargs):
+		pass
+
+	def __getattr__(self, name):
+		if name.startswith("__"):
+			raise AttributeError(name)
+		return Dummy()
+
+def _standinClass(name):
+	return type(name, (Standin,), {})
+
+"""
+screens keep their widgets by name, like the Screen of enigma
+"""
+class Screen(dict):
+	def __init__(self, session = None, parent = None):
+		dict.__init__(self)
+		self.session = session
+		self.onLayoutFinish = []
+		self.onClose = []
+		self.onShown = []
+
+	def close(self, *retval):
+		pass
+
+	def setTitle(self, title):
+		pass
+
+class SelectionList(Standin):
+	def __init__(self, list = None, enableWrapAround = False):
+		self.list = list or []
+
+	def setList(self, list):
+		self.list = list
+
+"""
+the entry of the list holds the data-tuple and the rendering-instructions for the list-box
+"""
+def SelectionEntryComponent(description, value, index, selected):
+	return [(description, value, index, selected), (0, 0, 0, 500, 30, 0, 0, description)]
+
+"""
+reads the pages of the help-file like the XMLHelpReader of MPHelp, returns the arguments of registerHelp
+"""
+def XMLHelpReader(helpFile):
+	from xml.etree.cElementTree import parse
+	root = parse(helpFile).getroot()
+	pages = []
+	for page in root.findall("page"):
+		texts = [(text.get("language", "en"), text.get("value")) for text in page.findall("text")]
+		pages.append((page.get("ID"), page.get("title"), texts))
+	return (pages, root.get("caption"), root.get("skin"))
+
+class HelpEntry:
+	def __init__(self, pages, caption, skin):
+		self.pages = pages
+		self.caption = caption
+
+	def open(self, session):
+		pass
+
+registeredHelp = []
+
+def registerHelp(pages, caption, skin):
+	help = HelpEntry(pages, caption, skin)
+	registeredHelp.append(help)
+	return help
+
+def resolveFilename(scope, path = ""):
+	if path.startswith("SystemPlugins/xmlConfigTool"):
+		return SRC_PATH + path[len("SystemPlugins/xmlConfigTool"):]
+	return path
+
+class Language:
+	def getLanguage(self):
+		return "en_EN"
+
+	def addCallback(self, callback):
+		pass
+
+# name -> module of the stand-ins, see install
+standinModules = {}
+# names of the stand-ins, which were imported since install(lazy = True)
+importedStandins = []
+
+"""
+provides the stand-ins on their import, so it can be checked which of them are needed
+"""
+class StandinImporter:
+	def find_module(self, fullname, path = None):
+		if fullname in standinModules:
+			return self
+		return None
+
+	def load_module(self, fullname):
+		module = sys.modules.get(fullname)
+		if module == None:
+			module = sys.modules[fullname] = standinModules[fullname]
+			importedStandins.append(fullname)
+		return module
+
+def _addModule(name, **attributes):
+	module = standinModules.get(name)
+	if module == None:
+		module = standinModules[name] = sys.modules.get(name) or types.ModuleType(name)
+		if not hasattr(module, "__path__"):
+			# every stand-in may contain further modules
+			module.__path__ = []
+		if "." in name:
+			parent, child = name.rsplit(".", 1)
+			setattr(_addModule(parent), child, module)
+	for attribute, value in attributes.iteritems():
+		setattr(module, attribute, value)
+	return module
+
+"""
+registers the stand-ins and the plugin-package (src) as Plugins.SystemPlugins.xmlConfigTool
+	existing modules (e.g. on a box) aren't replaced
+	[level]:	level of the shown log-messages
+	[lazy]:		the stand-ins are imported on demand, and recorded in importedStandins
+"""
+def install(level = ERROR_LEVEL, lazy = False):
+	global logLevel
+	logLevel = level
+	if PACKAGE in sys.modules:
+		return
+	_addModule("Plugins.SystemPlugins.GeneralLogger.GeneralLogger", OutLogger = OutLogger, \
+		ERROR_LEVEL = ERROR_LEVEL, WARN_LEVEL = WARN_LEVEL, DEBUG_LEVEL = DEBUG_LEVEL)
+	_addModule("Tools.XMLTools", stringToXML = stringToXML)
+	_addModule("Tools.BoundFunction", boundFunction = boundFunction)
+	_addModule("Tools.Directories", resolveFilename = resolveFilename, SCOPE_PLUGINS = 0)
+	_addModule("Plugins.SystemPlugins.MPHelp", registerHelp = registerHelp, XMLHelpReader = XMLHelpReader)
+	_addModule("Plugins.Plugin", PluginDescriptor = _standinClass("PluginDescriptor"))
+	_addModule("Components.Language", language = Language())
+	_addModule("Screens.Screen", Screen = Screen)
+	_addModule("Components.SelectionList", SelectionList = SelectionList, \
+		SelectionEntryComponent = SelectionEntryComponent)
+	_addModule("enigma", eListboxPythonMultiContent = Dummy, gFont = Dummy, \
+		RT_HALIGN_LEFT = 0, RT_HALIGN_RIGHT = 2, RT_WRAP = 32)
+	_addModule("skin", parseColor = Dummy(), parseFont = Dummy())
+	_addModule("Components.config", config = Dummy(), configfile = Dummy(), \
+		KEY_LEFT = 0, KEY_RIGHT = 1, KEY_OK = 2)
+	for name in ("Components.ActionMap.ActionMap", "Components.ActionMap.HelpableActionMap", \
+			"Components.Pixmap.Pixmap", "Components.Label.Label", "Components.Button.Button", \
+			"Components.FileList.FileList", "Components.MenuList.MenuList", \
+			"Components.Sources.StaticText.StaticText", "Components.ConfigList.ConfigListScreen", \
+			"Components.config.ConfigText", "Components.config.ConfigDirectory", "Components.config.ConfigNumber", \
+			"Screens.Setup.SetupSummary", "Screens.HelpMenu.HelpMenu", "Screens.HelpMenu.HelpableScreen", \
+			"Screens.MessageBox.MessageBox", "Screens.ChoiceBox.ChoiceBox", "Screens.LocationBox.LocationBox"):
+		moduleName, className = name.rsplit(".", 1)
+		_addModule(moduleName, **{className: _standinClass(className)})
+	_addModule(PACKAGE, __path__ = [SRC_PATH])
+	if lazy:
+		sys.meta_path.insert(0, StandinImporter())
+		modules = [PACKAGE, "Plugins.SystemPlugins", "Plugins"]
+	else:
+		modules = standinModules.keys()
+	for name in modules:
+		if not name in sys.modules:
+			sys.modules[name] = standinModules[name]
+	# runs the __init__ of the plugin, like the import by enigma
+	execfile(os.path.join(SRC_PATH, "__init__.py"), sys.modules[PACKAGE].__dict__)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+"""
+Stress test of the thread-safe mode of XMLConfigSupport (adjustThreadSafe)
+	reader-threads iterate the objects, writer-threads add, remove and write them,
+	a query-thread queries the indexes and checks the results,
+	and a reload-thread invalidates and reads the xml-file, all at the same time
+	afterwards the xml-file has to contain exactly the objects in ram
+	the longest operation of each thread shows, how long it waited for the lock at most,
+	the xml-file is parsed and written without the lock, so the readers don't wait for it
+
+	python benchmarks/stress_threads.py [seconds] [--unsafe]
+"""
+import os
+import sys
+import tempfile
+import threading
+from random import Random
+from time import time
+from traceback import format_exc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import standins
+standins.install()
+
+from Plugins.SystemPlugins.xmlConfigTool.XMLConfigSupport import XMLConfigSupport
+from Plugins.SystemPlugins.xmlConfigTool.XMLConfigObject import XMLConfigObject
+from Plugins.SystemPlugins.xmlConfigTool.XMLConfigSchema import XMLConfigField, XMLConfigBoolCodec, XMLConfigIntCodec
+
+class Entry(XMLConfigObject):
+	fields = (("value", 0),)
+
+def createSupport(xmlFile):
+	support = XMLConfigSupport(xmlFile, "entry", Entry, supportName = "stress")
+	support.adjustXmlRootNode("entries")
+	support.adjustSchema([XMLConfigField("key"), XMLConfigField("name"), \
+		XMLConfigField("enabled", XMLConfigBoolCodec()), XMLConfigField("value", XMLConfigIntCodec())])
+	return support
+
+class Worker(threading.Thread):
+	def __init__(self, name, func, endTime, seed):
+		threading.Thread.__init__(self, name = name)
+		self.func = func
+		self.endTime = endTime
+		self.random = Random(seed)
+		self.operations = 0
+		self.longest = 0.0
+		self.errors = []
+
+	def run(self):
+		while time() < self.endTime:
+			try:
+				startTime = time()
+				self.func(self.random)
+				self.longest = max(self.longest, time() - startTime)
+				self.operations += 1
+			except:
+				self.errors.append(format_exc())
+
+def main(seconds, threadSafe):
+	xmlFile = os.path.join(tempfile.mkdtemp(), "stress.xml")
+	support = createSupport(xmlFile)
+	support.adjustThreadSafe(threadSafe)
+	for i in range(1000):
+		support.add(Entry(key = str(i), name = "Entry %d" % (i), value = i))
+	support.writeXml()
+	support.addIndex("enabled")
+	support.addIndex("value", ordered = True)
+
+	def read(random):
+		for object in support.getObjectList():
+			object.key
+		support.get(str(random.randint(0, 2000)))
+		support.getSortedTupleList()
+
+	def change(random):
+		key = str(random.randint(0, 2000))
+		if random.random() < 0.5:
+			support.add(Entry(key = key, name = "Entry %s" % (key), value = random.randint(0, 1000)), True)
+		else:
+			object = support.get(key)
+			if object != None:
+				support.remove(object)
+		if random.random() < 0.1:
+			support.writeXml()
+
+	def query(random):
+		low = random.randint(0, 1000)
+		for object in support.query().where("enabled", True).range("value", low, low + 100).orderBy("name").all():
+			if not object.enabled or not low <= object.value <= low + 100:
+				raise AssertionError("query returned %s with value %d, not within %d-%d" % (object.key, object.value, low, low + 100))
+		support.query().prefix("name", "Entry 1").limit(10).all()
+		support.getIndexStats()
+		support.getStats()
+
+	def reload(random):
+		support.invalidateXML()
+		support.readXml()
+
+	endTime = time() + seconds
+	workers = [Worker("read%d" % (i), read, endTime, i) for i in range(3)] \
+		+ [Worker("change%d" % (i), change, endTime, 10 + i) for i in range(2)] \
+		+ [Worker("query", query, endTime, 30)] \
+		+ [Worker("reload", reload, endTime, 20)]
+	for worker in workers:
+		worker.start()
+	for worker in workers:
+		worker.join()
+
+	errors = []
+	for worker in workers:
+		errors.extend(worker.errors)
+		print "%-8s %8d operations, longest %6.1fms, %d errors" % (worker.name, worker.operations, \
+			worker.longest * 1000, len(worker.errors))
+	support.writeXml()
+	check = createSupport(xmlFile)
+	check.readXml()
+	consistent = sorted(check.objects.keys()) == sorted(support.objects.keys())
+	print "file consistent with ram: %s" % (consistent)
+	if errors:
+		print "first error:\n%s" % (errors[0])
+	return 0 if consistent and not errors else 1
+
+if __name__ == "__main__":
+	args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+	sys.exit(main(float(args[0]) if args else 5.0, not "--unsafe" in sys.argv))
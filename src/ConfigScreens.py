@@ -37,7 +37,7 @@ class ConfigObjectList(MenuList):
 		self.l.setBuildFunc(self.buildListboxEntry)
 		self.l.setItemHeight(25)
 		self.colorDisabled = 12368828
-		self.log = loggerInstance
+		self.log = getGeneralLogger(loggerInstance = loggerInstance)
 
 	"""
 	You have to return a list of the content you want to show in Overview
@@ -116,15 +116,15 @@ class ConfigObjectOverview(Screen, HelpableScreen):
 			Screen.__init__(self, session)
 			HelpableScreen.__init__(self)
 			
-			self.log = loggerInstance
-			if self.log == None:
-				self.log = getGeneralLogger()
+			self.log = getGeneralLogger(loggerInstance = loggerInstance)
 			
 			self.objectSupport = xmlConfigSupportInstance
 			self.objectSupport.objectOperationForbidden = True
 			
 			self.lastXmlDir = None
 			self.changed = False
+			# (importObjects, diff to the objects in ram) of the running import
+			self.importDiff = None
 	
 			# Button Labels
 			self["key_red"] = StaticText(_("Delete"))
@@ -200,14 +200,35 @@ class ConfigObjectOverview(Screen, HelpableScreen):
 			]
 			
 			self.onLayoutFinish.append(self.setCustomTitle)
+			self.onLayoutFinish.append(self.loadConfiguration)
 			self.onClose.append(self.onCloseAction)
 		except:
 			if self.log:
-				self.log.printOut("ConfigObjectOverview-Init-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+				self.log.printOut("ConfigObjectOverview-Init-Error:\n%s", format_exc, level = ERROR_LEVEL)
 			else:
-				getGeneralLogger().printOut("ConfigObjectOverview-Init-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+				getGeneralLogger().printOut("ConfigObjectOverview-Init-Error:\n%s", format_exc, level = ERROR_LEVEL)
 			self.close()
 
+	"""
+		reloads the objects from the xml-file without blocking, if it was changed
+		the reload is dropped if the objects were changed in the meantime
+	"""
+	def loadConfiguration(self):
+		try:
+			if self.objectSupport.writeXMLNeeded:
+				return
+			self.objectSupport.readXmlAsync(cancelFunc = lambda: self.changed or self.objectSupport.writeXMLNeeded) \
+				.addCallbacks(self.loadConfigurationFinal, self.asyncError)
+		except:
+			self.log.printOut("loadConfiguration-Error:\n%s", format_exc, level = ERROR_LEVEL)
+
+	def loadConfigurationFinal(self, count):
+		if count > 0:
+			self.refresh()
+
+	def asyncError(self, failure):
+		self.log.printOut("async-Error:\n%s", failure.getTraceback, level = ERROR_LEVEL)
+
 	def refresh(self):
 		cur = self["config"].getCurrent()
 		self["config"].setList(self.objectSupport.getSortedTupleList())
@@ -245,7 +266,7 @@ class ConfigObjectOverview(Screen, HelpableScreen):
 				except Exception:
 					pass
 		except:
-			self.log.printOut("selectionChanged-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("selectionChanged-Error:\n%s", format_exc, level = ERROR_LEVEL)
 
 	def showKeyHelp(self):
 		self.session.openWithCallback(self.callHelpAction, HelpMenu, self.helpList)
@@ -324,7 +345,7 @@ class ConfigObjectOverview(Screen, HelpableScreen):
 				keys = keys,
 			)
 		except:
-			self.log.printOut("build context-menu-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("build context-menu-Error:\n%s", format_exc, level = ERROR_LEVEL)
 
 	def menuCallback(self, ret):
 		ret = ret and ret[1]
@@ -348,11 +369,11 @@ class ConfigObjectOverview(Screen, HelpableScreen):
 			self.save(closeOverview = False)
 		if self.objectSupport.objectSelect:
 			self.session.openWithCallback(self.exportConfigurationFileSelect,
-				self.objectSupport.objectSelect, self.objectSupport.objects.values(), 
-				self.objectSupport.objects.values(), 
+				self.objectSupport.objectSelect, self.objectSupport.getObjectList(), 
+				self.objectSupport.getObjectList(), 
 				windowTitle = _("Select %s for export ...") % (self.objectSupport.objectPlural))
 		else:
-			self.exportConfigurationFileSelect(self.objectSupport.objects.values())
+			self.exportConfigurationFileSelect(self.objectSupport.getObjectList())
 	
 	def exportConfigurationFileSelect(self, configObjects = None):
 		if configObjects != None and len(configObjects) > 0:
@@ -370,49 +391,73 @@ class ConfigObjectOverview(Screen, HelpableScreen):
 	def exportConfigurationFinal(self, configObjects, xmlFile = None):
 		try:
 			if xmlFile != None:
-				if self.objectSupport.writeXml(xmlFile, configObjects):
-					self.saveLastXMLDir(os.path.dirname(xmlFile))
-					self.session.open(MessageBox, _("%d %s saved to \"%s\"") \
-						% (len(configObjects), self.objectSupport.objectSingular if len(configObjects) == 1 \
-							else self.objectSupport.objectPlural, os.path.basename(xmlFile)), \
-						MessageBox.TYPE_INFO, title = _("Export Configuration"))
-				else:
-					self.session.open(MessageBox, _("The Configuration couldn't be written!"), \
-						MessageBox.TYPE_ERROR, title = _("Export Configuration"))
+				self["info"].setText(_("Export Configuration") + " ...")
+				self.objectSupport.writeXmlAsync(xmlFile, configObjects).addCallbacks( \
+					boundFunction(self.exportConfigurationWritten, configObjects, xmlFile), self.asyncError)
+		except:
+			self.log.printOut("exportConfigurationFinal-Error:\n%s", format_exc, level = ERROR_LEVEL)
+
+	def exportConfigurationWritten(self, configObjects, xmlFile, written):
+		try:
+			self["info"].setText("")
+			if written:
+				self.saveLastXMLDir(os.path.dirname(xmlFile))
+				self.session.open(MessageBox, _("%d %s saved to \"%s\"") \
+					% (len(configObjects), self.objectSupport.objectSingular if len(configObjects) == 1 \
+						else self.objectSupport.objectPlural, os.path.basename(xmlFile)), \
+					MessageBox.TYPE_INFO, title = _("Export Configuration"))
+			else:
+				self.session.open(MessageBox, _("The Configuration couldn't be written!"), \
+					MessageBox.TYPE_ERROR, title = _("Export Configuration"))
 		except:
-			self.log.printOut("exportConfigurationFinal-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("exportConfigurationWritten-Error:\n%s", format_exc, level = ERROR_LEVEL)
 	
 	def importConfiguration(self):
 		try:
-			from XMLConfigTools import selectFile
-			self.log.printOut("[REALDEBUG] importConfiguration vor selectFile,startDir=%s" % str(self.getLastXMLDir()), level = ERROR_LEVEL)
+			from XMLConfigFileDialog import selectFile
+			self.log.printOut("[REALDEBUG] importConfiguration vor selectFile,startDir=%s", self.getLastXMLDir(), level = ERROR_LEVEL)
 			selectFile(self.session, self.importConfigFileSelected, startDir = self.getLastXMLDir(), \
 				showFiles = True, matchingPattern = "(?i)^.*(?!help)\.xml$", selOnlyFiles = True)
 		except:
-			self.log.printOut("importConfiguration-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("importConfiguration-Error:\n%s", format_exc, level = ERROR_LEVEL)
 
 	def importConfigFileSelected(self, xmlFile = None):
 		try:
 			if xmlFile:
-				importObjects = []
-				importCount = self.objectSupport.readXml(inOutObjectList = importObjects, 
-					xmlFile = xmlFile, clearExisting = False, writeToRam = False)
-				if importCount > 0:
-					self.saveLastXMLDir(os.path.dirname(xmlFile))
-					if self.objectSupport.objectSelect:
-						self.session.openWithCallback(boundFunction(self.importConfigFileLoaded, xmlFile),
-							self.objectSupport.objectSelect, importObjects, importObjects, 
-							windowTitle = _("Select %s for import ...") % (self.objectSupport.objectPlural))
-					else:
-						self.importConfigFileLoaded(importxmlFile = xmlFile, importObjects = importObjects)
-				elif importCount == 0:
-					self.session.open(MessageBox, _("There are no (new) entries in the configuration!"), \
-						MessageBox.TYPE_INFO, title = _("Configuration-Import"))
+				self["info"].setText(_("Configuration-Import") + " ...")
+				self.objectSupport.parseXmlAsync(xmlFile).addCallbacks( \
+					boundFunction(self.importConfigFileParsed, xmlFile), self.asyncError)
+		except:
+			self.log.printOut("importConfigFileSelected-Error:\n%s", format_exc, level = ERROR_LEVEL)
+
+	def importConfigFileParsed(self, xmlFile, importObjects):
+		try:
+			self["info"].setText("")
+			importCount = len(importObjects) if importObjects != None else -1
+			if importCount > 0:
+				self.saveLastXMLDir(os.path.dirname(xmlFile))
+				if self.objectSupport.objectSelect:
+					self.session.openWithCallback(boundFunction(self.importConfigFileLoaded, xmlFile),
+						self.objectSupport.objectSelect, importObjects, importObjects, 
+						windowTitle = _("Select %s for import ...") % (self.objectSupport.objectPlural))
 				else:
-					self.session.open(MessageBox, _("The Configuration couldn't be loaded!"), \
-						MessageBox.TYPE_ERROR, title = _("Configuration-Import"))
+					self.importConfigFileLoaded(importxmlFile = xmlFile, importObjects = importObjects)
+			elif importCount == 0:
+				self.session.open(MessageBox, _("There are no (new) entries in the configuration!"), \
+					MessageBox.TYPE_INFO, title = _("Configuration-Import"))
+			else:
+				self.session.open(MessageBox, _("The Configuration couldn't be loaded!"), \
+					MessageBox.TYPE_ERROR, title = _("Configuration-Import"))
 		except:
-			self.log.printOut("importConfigFileSelectedCB-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("importConfigFileSelectedCB-Error:\n%s", format_exc, level = ERROR_LEVEL)
+
+	"""
+		returns the diff of the import to the objects in ram, see XMLConfigSupport.diffObjects
+	"""
+	def getImportDiff(self, importObjects):
+		if self.importDiff == None or self.importDiff[0] is not importObjects:
+			self.importDiff = (importObjects, self.objectSupport.diffObjects(importObjects))
+		return self.importDiff[1]
 
 	def importConfigFileLoaded(self, importxmlFile = "", importObjects = None):
 		if importObjects != None and len(importObjects) > 0:
@@ -429,12 +474,8 @@ class ConfigObjectOverview(Screen, HelpableScreen):
 	def importConfigAskOverwrite(self, importObjects = [], importxmlFile = "", keepExisting = True):
 		try:
 			if keepExisting:
-				askOverwrite = False
-				for importObject in importObjects:
-					for registeredObject in self.objectSupport.objects.values():
-						if importObject.key == registeredObject.key:
-							askOverwrite = True
-							break
+				# only ask if there are entries with the same key, but another content
+				askOverwrite = len(self.getImportDiff(importObjects)["changed"]) > 0
 				if askOverwrite:
 					self.session.openWithCallback(boundFunction(self.importConfigAskFurther, \
 						importObjects, importxmlFile, keepExisting), MessageBox, \
@@ -447,7 +488,7 @@ class ConfigObjectOverview(Screen, HelpableScreen):
 				self.importConfigAskFurther(importObjects = importObjects, importxmlFile = importxmlFile, \
 					keepExisting = keepExisting, overwriteExisting = False)
 		except:
-			self.log.printOut("importConfigAskOverwrite-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("importConfigAskOverwrite-Error:\n%s", format_exc, level = ERROR_LEVEL)
 	
 	"""
 		extend for further handling
@@ -464,26 +505,39 @@ class ConfigObjectOverview(Screen, HelpableScreen):
 		try:
 			if doImport:
 				import os
+				# identical entries are not touched
+				diff = self.getImportDiff(importObjects)
+				removedCount = 0
 				if not keepExisting:
-					self.objectSupport.clear()
-				importCount = self.objectSupport.writeConfigToRam(importObjects, \
+					for key in diff["removed"]:
+						self.objectSupport.remove(self.objectSupport.get(key))
+					removedCount = len(diff["removed"])
+					overwriteExisting = True
+				importList = diff["added"]
+				if overwriteExisting:
+					importList = importList + diff["changed"]
+				importCount = self.objectSupport.writeConfigToRam(importList, \
 					overwriteExisting = overwriteExisting)
-				if importCount > 0:
+				self.importDiff = None
+				if importCount > 0 or removedCount > 0:
 					self.changed = True
 					self.refresh()
-				self.session.open(MessageBox, _("%d %s loaded from \"%s\"!") \
+				message = _("%d %s loaded from \"%s\"!") \
 					% (importCount, self.objectSupport.objectSingular if importCount == 1 \
-						else self.objectSupport.objectPlural, os.path.basename(importxmlFile)), \
-					MessageBox.TYPE_INFO, title = _("Configuration-Import"))
+						else self.objectSupport.objectPlural, os.path.basename(importxmlFile))
+				if removedCount > 0:
+					message += "\n" + _("%d %s removed!") % (removedCount, self.objectSupport.objectSingular \
+						if removedCount == 1 else self.objectSupport.objectPlural)
+				self.session.open(MessageBox, message, MessageBox.TYPE_INFO, title = _("Configuration-Import"))
 		except:
-			self.log.printOut("importConfigFinal-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("importConfigFinal-Error:\n%s", format_exc, level = ERROR_LEVEL)
 	
 	def showMainHelp(self):
 		try:
 			from plugin import showMainHelp
 			showMainHelp(self.session)
 		except:
-			self.log.printOut("showMainHelp-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("showMainHelp-Error:\n%s", format_exc, level = ERROR_LEVEL)
 
 	def cancel(self):
 		if self.changed:
@@ -546,9 +600,7 @@ class ConfigObjectEditor(Screen, ConfigListScreen, HelpableScreen):
 	def __init__(self, session, xmlConfigSupportInstance, configObject = None, \
 			isUpdating = False, objectName = "", loggerInstance = None):
 		try:
-			self.log = loggerInstance
-			if self.log == None:
-				self.log = getGeneralLogger()
+			self.log = getGeneralLogger(loggerInstance = loggerInstance)
 			
 			Screen.__init__(self, session)
 	
@@ -583,9 +635,9 @@ class ConfigObjectEditor(Screen, ConfigListScreen, HelpableScreen):
 						x()
 					except:
 						if "log" in self:
-							self.log.printOut("overwritten-selectionChanged-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+							self.log.printOut("overwritten-selectionChanged-Error:\n%s", format_exc, level = ERROR_LEVEL)
 						else:
-							getGeneralLogger().printOut("overwritten-selectionChanged-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+							getGeneralLogger().printOut("overwritten-selectionChanged-Error:\n%s", format_exc, level = ERROR_LEVEL)
 
 			self["config"].selectionChanged = selectionChanged
 			# other handling
@@ -649,9 +701,9 @@ class ConfigObjectEditor(Screen, ConfigListScreen, HelpableScreen):
 			self.onLayoutFinish.append(self.setCustomTitle)
 		except:
 			if "log" in self:
-				self.log.printOut("ConfigObject-Editor-Init-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+				self.log.printOut("ConfigObject-Editor-Init-Error:\n%s", format_exc, level = ERROR_LEVEL)
 			else:
-				getGeneralLogger().printOut("ConfigObject-Editor-Init-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+				getGeneralLogger().printOut("ConfigObject-Editor-Init-Error:\n%s", format_exc, level = ERROR_LEVEL)
 			self.close(None)
 	
 	"""
@@ -781,7 +833,7 @@ class ConfigObjectEditor(Screen, ConfigListScreen, HelpableScreen):
 			if res:
 				configElement.setValue(res)
 		except:
-			self.log.printOut("directorySelected-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("directorySelected-Error:\n%s", format_exc, level = ERROR_LEVEL)
 
 	def showKeyHelp(self):
 		self.session.openWithCallback(self.callHelpAction, HelpMenu, self.helpList)
@@ -850,7 +902,7 @@ class ConfigObjectEditor(Screen, ConfigListScreen, HelpableScreen):
 				else:
 					self.checkOK(True)
 			except:
-				self.log.printOut("ConfigObject-Editor-checkObject-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+				self.log.printOut("ConfigObject-Editor-checkObject-Error:\n%s", format_exc, level = ERROR_LEVEL)
 
 	def checkOK(self, ret):
 		if ret:
@@ -886,9 +938,7 @@ class ConfigObjecSelect(Screen):
 		try:
 			Screen.__init__(self, session)
 
-			self.log = loggerInstance
-			if self.log == None:
-				self.log = getGeneralLogger()
+			self.log = getGeneralLogger(loggerInstance = loggerInstance)
 		
 			self.objectSupport = xmlConfigSupportInstance
 			self.selectedObjects = {}
@@ -896,6 +946,8 @@ class ConfigObjecSelect(Screen):
 				for object in preSelectedObjects:
 					self.selectedObjects[object.key] = object
 			self.availableObjects = availableObjects
+			# sort only once, the filter and select-all only change the shown entries
+			self.sortedObjects = sorted(self.availableObjects, key = lambda object: object.name.lower())
 			self.allSelected = False
 			if len(self.selectedObjects) == len(self.availableObjects):
 				self.allSelected = True
@@ -934,16 +986,16 @@ class ConfigObjecSelect(Screen):
 			self.onLayoutFinish.append(self.setCustomTitle)
 		except:
 			if "log" in self:
-				self.log.printOut("ConfigObject-Select-Init-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+				self.log.printOut("ConfigObject-Select-Init-Error:\n%s", format_exc, level = ERROR_LEVEL)
 			else:
-				getGeneralLogger().printOut("ConfigObject-Select-Init-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+				getGeneralLogger().printOut("ConfigObject-Select-Init-Error:\n%s", format_exc, level = ERROR_LEVEL)
 			self.close()
 
 	def setSelection(self, selectAll = False, deselcetAll = False):
 		entries = []
 		index = 0
 		
-		for object in sorted(self.availableObjects, key=lambda object: object.name.lower()):
+		for object in self.sortedObjects:
 			if not self.showDisabled and not object.enabled:
 				continue
 			if selectAll or deselcetAll:
@@ -1034,4 +1086,4 @@ class ConfigObjecSelect(Screen):
 			
 			self.close(objectList)
 		except:
-			self.log.printOut("ConfigObject-Select-keyClose-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("ConfigObject-Select-keyClose-Error:\n%s", format_exc, level = ERROR_LEVEL)
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+from twisted.internet import reactor
+from twisted.internet.threads import deferToThreadPool
+from twisted.python.threadpool import ThreadPool
+
+# threads for parsing and writing xml-files, shared by all instances of XMLConfigSupport
+MAX_THREADS = 2
+
+threadPool = None
+
+def getThreadPool():
+	global threadPool
+	if threadPool == None:
+		threadPool = ThreadPool(minthreads = 0, maxthreads = MAX_THREADS, name = "XMLConfigAsync")
+		threadPool.start()
+		reactor.addSystemEventTrigger("during", "shutdown", threadPool.stop)
+	return threadPool
+
+"""
+runs the function within the thread-pool, returns a Deferred which fires with its result on the main loop
+"""
+def deferToPool(func, *args, **kwargs):
+	return deferToThreadPool(reactor, getThreadPool(), func, *args, **kwargs)
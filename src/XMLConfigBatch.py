@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+from XMLConfigTools import ERROR_LEVEL, WARN_LEVEL, DEBUG_LEVEL
+
+"""
+Transaction for bulk changes of the objects of XMLConfigSupport, see XMLConfigSupport.batch
+	within the batch the hooks and the writing of the xml-file are deferred until the commit,
+	if an exception escapes, the objects in ram are restored and the deferred hooks are dropped
+	objects which are changed in place can't be restored
+	nested batches are merged into the outer batch
+
+objectSupport:		the instance of XMLConfigSupport
+writeToDisk:		refresh ram from the xml-file at the beginning, and write it once at the commit
+"""
+class XMLConfigBatch:
+	def __init__(self, objectSupport, writeToDisk = True):
+		self.objectSupport = objectSupport
+		self.writeToDisk = writeToDisk
+		self.nested = False
+		# key -> object before the batch, None if the key didn't exist
+		self.originals = {}
+		self.hooks = []
+		self.writeRequested = False
+		self.summary = None
+
+	def __enter__(self):
+		if self.objectSupport.currentBatch != None:
+			self.nested = True
+			return self
+		if self.writeToDisk:
+			# save "unsafed" values and refresh ram, only once for the whole batch
+			self.objectSupport.writeXmlIfNeeded(ignoreObjectOperationForbidden = True)
+			self.objectSupport.readXml()
+		self.objectSupport.currentBatch = self
+		return self
+
+	def __exit__(self, excType, excValue, traceback):
+		if self.nested:
+			return False
+		self.objectSupport.currentBatch = None
+		if excType != None:
+			self.rollback()
+		else:
+			self.commit()
+		return False
+
+	"""
+	remembers the object of the key, before it is changed the first time
+	"""
+	def touch(self, objectKey):
+		if not objectKey in self.originals:
+			self.originals[objectKey] = self.objectSupport.objects.get(objectKey)
+
+	def deferHook(self, hook, args):
+		self.hooks.append((hook, args))
+
+	def commit(self):
+		objects = self.objectSupport.objects
+		added = changed = removed = 0
+		for key, original in self.originals.iteritems():
+			current = objects.get(key)
+			if original == None:
+				if current != None:
+					added += 1
+			elif current == None:
+				removed += 1
+			elif current is not original:
+				changed += 1
+		self.summary = {"added": added, "changed": changed, "removed": removed, "hooks": len(self.hooks)}
+
+		for hook, args in self.hooks:
+			hook(*args)
+		self.hooks = []
+		if self.writeToDisk and (self.writeRequested or added or changed or removed):
+			self.objectSupport.writeXml()
+		self.objectSupport.log.printOut("Batch committed: %d added, %d changed, %d removed, %d hooks called.", \
+			added, changed, removed, self.summary["hooks"], level = DEBUG_LEVEL)
+
+	def rollback(self):
+		for key, original in self.originals.iteritems():
+			if original == None:
+				if key in self.objectSupport.objects:
+					self.objectSupport._removeKey(key)
+			else:
+				self.objectSupport._insert(original)
+		self.objectSupport.log.printOut("Batch rolled back: %d objects restored, %d hooks dropped.", \
+			len(self.originals), len(self.hooks), level = WARN_LEVEL)
+		self.hooks = []
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left, bisect_right
+from locale import strxfrm
+from operator import itemgetter
+
+"""
+Secondary indexes for the objects of XMLConfigSupport, see XMLConfigSupport.addIndex
+
+name:			name of the index, used by the queries
+valueFunc:		function which returns the indexed value of an object
+"""
+class XMLConfigHashIndex:
+	indexType = "hash"
+
+	def __init__(self, name, valueFunc):
+		self.name = name
+		self.valueFunc = valueFunc
+		# value -> set of object-keys
+		self.entries = {}
+		# object-key -> indexed value, to remove objects which were changed in place
+		self.keyValues = {}
+		self.lookups = 0
+
+	def __len__(self):
+		return len(self.keyValues)
+
+	def insert(self, object):
+		value = self.valueFunc(object)
+		self.keyValues[object.key] = value
+		keys = self.entries.get(value)
+		if keys == None:
+			keys = self.entries[value] = set()
+		keys.add(object.key)
+
+	def remove(self, objectKey):
+		if objectKey in self.keyValues:
+			value = self.keyValues.pop(objectKey)
+			keys = self.entries[value]
+			keys.discard(objectKey)
+			if not keys:
+				del self.entries[value]
+
+	def clear(self):
+		self.entries.clear()
+		self.keyValues.clear()
+
+	"""
+	fills the index with the objects at once, instead of inserting them one by one
+	"""
+	def build(self, objects):
+		self.clear()
+		for object in objects:
+			self.insert(object)
+
+	def equal(self, value):
+		self.lookups += 1
+		return set(self.entries.get(value, ()))
+
+"""
+ordered index, for equality-, range- and prefix-queries and for sorting
+"""
+class XMLConfigOrderedIndex(XMLConfigHashIndex):
+	indexType = "ordered"
+
+	def __init__(self, name, valueFunc):
+		XMLConfigHashIndex.__init__(self, name, valueFunc)
+		# sorted values and the object-keys at the same position
+		self.values = []
+		self.keys = []
+
+	def insert(self, object):
+		value = self.valueFunc(object)
+		self.keyValues[object.key] = value
+		pos = bisect_right(self.values, value)
+		self.values.insert(pos, value)
+		self.keys.insert(pos, object.key)
+
+	def remove(self, objectKey):
+		if objectKey in self.keyValues:
+			value = self.keyValues.pop(objectKey)
+			pos = self.keys.index(objectKey, bisect_left(self.values, value), bisect_right(self.values, value))
+			del self.values[pos]
+			del self.keys[pos]
+
+	def clear(self):
+		XMLConfigHashIndex.clear(self)
+		del self.values[:]
+		del self.keys[:]
+
+	"""
+	sorts the objects once, instead of inserting every object into the sorted lists (O(n) per object)
+		the sort is stable, so objects with the same value keep their order, like with insert
+		returns the sorted (value, object)-tuples
+	"""
+	def build(self, objects):
+		valueFunc = self.valueFunc
+		entries = [(valueFunc(object), object) for object in objects]
+		entries.sort(key = itemgetter(0))
+		keyValues = self.keyValues
+		keyValues.clear()
+		for value, object in entries:
+			keyValues[object.key] = value
+		# the lists are replaced in place, they may be referenced
+		self.values[:] = [entry[0] for entry in entries]
+		self.keys[:] = [entry[1].key for entry in entries]
+		return entries
+
+	def equal(self, value):
+		return self.range(value, value)
+
+	"""
+	returns the keys of all objects with low <= value <= high, None means unlimited
+	"""
+	def range(self, low = None, high = None):
+		self.lookups += 1
+		start = 0
+		end = len(self.values)
+		if low != None:
+			start = bisect_left(self.values, low)
+		if high != None:
+			end = bisect_right(self.values, high)
+		return set(self.keys[start:end])
+
+	def prefix(self, prefix):
+		self.lookups += 1
+		keys = set()
+		pos = bisect_left(self.values, prefix)
+		while pos < len(self.values) and self.values[pos].startswith(prefix):
+			keys.add(self.keys[pos])
+			pos += 1
+		return keys
+
+	"""
+	returns the object-keys sorted by the indexed value
+	"""
+	def sortedKeys(self, reverse = False):
+		self.lookups += 1
+		if reverse:
+			return reversed(self.keys)
+		return iter(self.keys)
+
+"""
+predefined orderings for the sorted views, the objects have to provide "name" and "enabled"
+"""
+SORTED_VIEW_KEYS = {
+	"name": lambda object: object.name.lower(),
+	"locale": lambda object: strxfrm(object.name),
+	"enabledFirst": lambda object: (not object.enabled, object.name.lower()),
+}
+
+"""
+Sorted list of the objects, which is kept up to date on every change, see XMLConfigSupport.getSortedView
+	the sort-key of every object is computed only once, when it is added
+	provides the objects by position and the tuples for the MenuLists (without copying)
+"""
+class XMLConfigSortedView(XMLConfigOrderedIndex):
+	indexType = "sorted"
+
+	def __init__(self, name, valueFunc):
+		XMLConfigOrderedIndex.__init__(self, name, valueFunc)
+		# (object,)-tuples at the same position as the keys
+		self.tuples = []
+
+	def __len__(self):
+		return len(self.tuples)
+
+	def __getitem__(self, pos):
+		return self.tuples[pos][0]
+
+	def __iter__(self):
+		for entry in self.tuples:
+			yield entry[0]
+
+	def insert(self, object):
+		value = self.valueFunc(object)
+		self.keyValues[object.key] = value
+		pos = bisect_right(self.values, value)
+		self.values.insert(pos, value)
+		self.keys.insert(pos, object.key)
+		self.tuples.insert(pos, (object,))
+
+	def remove(self, objectKey):
+		if objectKey in self.keyValues:
+			value = self.keyValues.pop(objectKey)
+			pos = self.keys.index(objectKey, bisect_left(self.values, value), bisect_right(self.values, value))
+			del self.values[pos]
+			del self.keys[pos]
+			del self.tuples[pos]
+
+	def clear(self):
+		XMLConfigOrderedIndex.clear(self)
+		del self.tuples[:]
+
+	def build(self, objects):
+		entries = XMLConfigOrderedIndex.build(self, objects)
+		self.tuples[:] = [(entry[1],) for entry in entries]
+		return entries
+
+	"""
+	returns the position of the object, or -1
+	"""
+	def indexOf(self, objectKey):
+		if objectKey in self.keyValues:
+			value = self.keyValues[objectKey]
+			return self.keys.index(objectKey, bisect_left(self.values, value), bisect_right(self.values, value))
+		return -1
+
+"""
+Query on the objects of XMLConfigSupport, created by XMLConfigSupport.query
+	the conditions are combined with "and", every function returns the query itself:
+		support.query().where("enabled", True).prefix("name", "A").orderBy("name").limit(10).all()
+	conditions on indexed attributes are served by the index, the others by scanning the objects
+"""
+class XMLConfigQuery:
+	def __init__(self, objectSupport):
+		self.objectSupport = objectSupport
+		self.conditions = []
+		self.orderAttr = None
+		self.orderReverse = False
+		self.maxCount = None
+		self.plan = []
+
+	def where(self, attr, value):
+		self.conditions.append(("where", attr, (value,)))
+		return self
+
+	"""
+	low <= value <= high, None means unlimited
+	"""
+	def range(self, attr, low = None, high = None):
+		self.conditions.append(("range", attr, (low, high)))
+		return self
+
+	def prefix(self, attr, prefix):
+		self.conditions.append(("prefix", attr, (prefix,)))
+		return self
+
+	def orderBy(self, attr, reverse = False):
+		self.orderAttr = attr
+		self.orderReverse = reverse
+		return self
+
+	def limit(self, count):
+		self.maxCount = count
+		return self
+
+	"""
+	returns the list of matching objects
+		with the thread-safe mode of XMLConfigSupport, the objects and indexes are read within its read-lock
+	"""
+	def all(self):
+		threadLock = self.objectSupport.threadLock
+		if threadLock == None:
+			return self._all()
+		threadLock.acquireRead()
+		try:
+			return self._all()
+		finally:
+			threadLock.releaseRead()
+
+	def _all(self):
+		objects = self.objectSupport.objects
+		indexes = self.objectSupport.indexes
+		self.plan = []
+
+		keys = None
+		scanConditions = []
+		for condition in self.conditions:
+			operation, attr, args = condition
+			index = indexes.get(attr)
+			if index != None and (operation == "where" or index.indexType == "ordered"):
+				if operation == "where":
+					found = index.equal(args[0])
+				elif operation == "range":
+					found = index.range(*args)
+				else:
+					found = index.prefix(args[0])
+				keys = found if keys == None else keys & found
+				self.plan.append("%s %s: %s-index \"%s\", %d keys" % (operation, attr, index.indexType, index.name, len(found)))
+			else:
+				scanConditions.append(condition)
+				self.plan.append("%s %s: scan" % (operation, attr))
+
+		if keys == None:
+			candidates = objects.itervalues()
+		else:
+			candidates = (objects[key] for key in keys if key in objects)
+		if scanConditions:
+			candidates = (object for object in candidates if self._matches(object, scanConditions))
+
+		if self.orderAttr == None:
+			result = []
+			for object in candidates:
+				if self.maxCount != None and len(result) >= self.maxCount:
+					break
+				result.append(object)
+			return result
+
+		index = indexes.get(self.orderAttr)
+		if index != None and index.indexType == "ordered":
+			self.plan.append("orderBy %s: ordered-index \"%s\"" % (self.orderAttr, index.name))
+			matching = set(object.key for object in candidates)
+			result = []
+			for key in index.sortedKeys(self.orderReverse):
+				if self.maxCount != None and len(result) >= self.maxCount:
+					break
+				if key in matching:
+					result.append(objects[key])
+			return result
+
+		self.plan.append("orderBy %s: sort" % (self.orderAttr))
+		valueFunc = self._getValueFunc(self.orderAttr)
+		result = sorted(candidates, key = valueFunc, reverse = self.orderReverse)
+		if self.maxCount != None:
+			result = result[:self.maxCount]
+		return result
+
+	"""
+	returns the description, how the conditions of the last execution were served
+	"""
+	def explain(self):
+		if not self.plan:
+			self.all()
+		return self.plan
+
+	def _getValueFunc(self, attr):
+		index = self.objectSupport.indexes.get(attr)
+		if index != None:
+			return index.valueFunc
+		return lambda object: getattr(object, attr, None)
+
+	def _matches(self, object, conditions):
+		for operation, attr, args in conditions:
+			value = self._getValueFunc(attr)(object)
+			if operation == "where":
+				if value != args[0]:
+					return False
+			elif operation == "range":
+				low, high = args
+				if (low != None and value < low) or (high != None and value > high):
+					return False
+			elif value == None or not value.startswith(args[0]):
+				return False
+		return True
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+from xml.etree.cElementTree import fromstring as cet_fromstring
+from collections import OrderedDict
+import mmap
+import re
+
+_xmlAttributes = r"(?:\s+[^\s=/>]+\s*=\s*(?:\"[^\"]*\"|'[^']*'))*"
+
+"""
+Dict-like replacement for XMLConfigSupport.objects, see XMLConfigSupport.adjustLazyLoad
+	the xml-file is scanned once via mmap, to find the byte-range of every entry by its key-attribute
+	an object is parsed on its first access, and kept in a size-bounded LRU-cache
+	objects which are added or changed in ram are kept until they are removed
+
+xmlFile:			the xml-file to scan, it stays opened until close
+xmlNode:			XML-Node which represent the stored object, it mustn't be nested within the same node
+keyAttribute:		XML-Attribute which contains the key of the object
+parseFunc:			function which creates the object of an xml-element, e.g. XMLConfigSupport.parseEntry
+cacheSize:			count of parsed objects which are kept in the cache
+"""
+class XMLConfigLazyObjects:
+	def __init__(self, xmlFile, xmlNode, keyAttribute, parseFunc, cacheSize = 1000):
+		self.parseFunc = parseFunc
+		self.cacheSize = cacheSize
+		# key -> (start, end) of the entries, which are only in the file
+		self.ranges = {}
+		# key -> object, which was added or changed in ram
+		self.pinned = {}
+		self.cache = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.errors = 0
+
+		self.file = open(xmlFile, 'rb')
+		self.map = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+		self._scan(xmlNode, keyAttribute)
+
+	def _scan(self, xmlNode, keyAttribute):
+		# imported here, xml.sax imports urllib, which slows down the start of enigma
+		from xml.sax.saxutils import unescape
+		node = re.escape(xmlNode)
+		entryRegex = re.compile(r"(<%s%s)\s*(?:/>|>.*?</%s\s*>)" % (node, _xmlAttributes, node), re.DOTALL)
+		keyRegex = re.compile(r"\s%s\s*=\s*(?:\"([^\"]*)\"|'([^']*)')" % (re.escape(keyAttribute)))
+		for match in entryRegex.finditer(self.map):
+			keyMatch = keyRegex.search(match.group(1))
+			if keyMatch == None:
+				continue
+			key = unescape(keyMatch.group(1) if keyMatch.group(1) != None else keyMatch.group(2), \
+				{"&quot;": "\"", "&apos;": "'"})
+			# the first entry of a key is used, like in writeConfigToRam
+			if not key in self.ranges:
+				self.ranges[key] = match.span()
+
+	def close(self):
+		self.cache.clear()
+		self.map.close()
+		self.file.close()
+
+	"""
+	returns the count of objects which are only in the file, changed in ram and cached,
+	the hits and misses of the cache and the count of unparsable entries
+	"""
+	def getStats(self):
+		return {"indexed": len(self.ranges), "pinned": len(self.pinned), "cached": len(self.cache), \
+			"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+	# dict-functions
+	def __len__(self):
+		return len(self.ranges) + len(self.pinned)
+
+	def __contains__(self, key):
+		return key in self.pinned or key in self.ranges
+
+	def __getitem__(self, key):
+		if key in self.pinned:
+			return self.pinned[key]
+		object = self.cache.pop(key, None)
+		if object != None:
+			self.hits += 1
+		else:
+			if not key in self.ranges:
+				raise KeyError(key)
+			self.misses += 1
+			start, end = self.ranges[key]
+			try:
+				object = self.parseFunc(cet_fromstring(self.map[start:end]))
+			except SyntaxError:
+				object = None
+			if object == None:
+				# unparsable entries are dropped, like while loading all objects
+				self.ranges.pop(key)
+				self.errors += 1
+				raise KeyError(key)
+			if len(self.cache) >= self.cacheSize:
+				self.cache.popitem(last = False)
+		self.cache[key] = object
+		return object
+
+	def __setitem__(self, key, object):
+		self.ranges.pop(key, None)
+		self.cache.pop(key, None)
+		self.pinned[key] = object
+
+	def __iter__(self):
+		return iter(self.keys())
+
+	def get(self, key, default = None):
+		try:
+			return self[key]
+		except KeyError:
+			return default
+
+	def pop(self, key, *default):
+		try:
+			object = self[key]
+		except KeyError:
+			if default:
+				return default[0]
+			raise
+		self.ranges.pop(key, None)
+		self.cache.pop(key, None)
+		self.pinned.pop(key, None)
+		return object
+
+	def clear(self):
+		self.ranges.clear()
+		self.pinned.clear()
+		self.cache.clear()
+
+	def keys(self):
+		return self.pinned.keys() + self.ranges.keys()
+
+	iterkeys = __iter__
+
+	"""
+	parses the objects one by one, only the last ones are kept in the cache
+	"""
+	def itervalues(self):
+		for key in self.keys():
+			object = self.get(key)
+			if object != None:
+				yield object
+
+	def values(self):
+		return list(self.itervalues())
+
+	def iteritems(self):
+		for key in self.keys():
+			object = self.get(key)
+			if object != None:
+				yield (key, object)
+
+	def items(self):
+		return list(self.iteritems())
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+import errno
+import fcntl
+import os
+from thread import get_ident
+from threading import Condition, Lock
+from time import time, sleep
+
+class XMLConfigLockTimeout(Exception):
+	pass
+
+"""
+Advisory lock (fcntl.flock) of a config-file between processes, see XMLConfigSupport.adjustLocking
+	a separate lock-file is used, because the config-file is replaced by renaming while writing
+	the lock is reentrant within the process, a nested acquire keeps the mode of the outer one
+
+lockFile:		path of the lock-file, it is created if it doesn't exist
+[timeout]:		seconds to wait for the lock, afterwards XMLConfigLockTimeout is raised
+"""
+class XMLConfigLock:
+	def __init__(self, lockFile, timeout = 2.0):
+		self.lockFile = lockFile
+		self.timeout = timeout
+		self.fd = -1
+		self.depth = 0
+		self.waitCount = 0
+
+	def acquire(self, exclusive = False):
+		if self.depth > 0:
+			self.depth += 1
+			return
+		if self.fd < 0:
+			self.fd = os.open(self.lockFile, os.O_RDWR | os.O_CREAT, 0644)
+		operation = (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB
+		endTime = time() + self.timeout
+		while True:
+			try:
+				fcntl.flock(self.fd, operation)
+				break
+			except IOError, e:
+				if e.errno not in (errno.EAGAIN, errno.EACCES):
+					raise
+			if time() >= endTime:
+				raise XMLConfigLockTimeout("%s lock of \"%s\" not acquired within %.1fs" \
+					% ("Exclusive" if exclusive else "Shared", self.lockFile, self.timeout))
+			self.waitCount += 1
+			sleep(0.01)
+		self.depth = 1
+
+	def release(self):
+		if self.depth == 0:
+			return
+		self.depth -= 1
+		if self.depth == 0:
+			fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+	def close(self):
+		if self.fd >= 0:
+			os.close(self.fd)
+			self.fd = -1
+		self.depth = 0
+
+"""
+Readers-writer lock between the threads of the process, see XMLConfigSupport.adjustThreadSafe
+	many readers or one writer, waiting writers are preferred, so they can't starve
+	both locks are reentrant, the writer may acquire the read-lock too,
+	but a reader can't upgrade to the write-lock (RuntimeError)
+"""
+class XMLConfigRWLock:
+	def __init__(self):
+		self.condition = Condition(Lock())
+		# thread-ident -> depth of the read-lock
+		self.readers = {}
+		self.writer = None
+		self.writerDepth = 0
+		self.waitingWriters = 0
+		self.readCount = 0
+		self.writeCount = 0
+
+	def acquireRead(self):
+		ident = get_ident()
+		with self.condition:
+			if self.writer == ident or ident in self.readers:
+				self.readers[ident] = self.readers.get(ident, 0) + 1
+				return
+			while self.writer != None or self.waitingWriters > 0:
+				self.condition.wait()
+			self.readers[ident] = 1
+			self.readCount += 1
+
+	def releaseRead(self):
+		ident = get_ident()
+		with self.condition:
+			depth = self.readers[ident] - 1
+			if depth > 0:
+				self.readers[ident] = depth
+			else:
+				del self.readers[ident]
+				if not self.readers:
+					self.condition.notify_all()
+
+	def acquireWrite(self):
+		ident = get_ident()
+		with self.condition:
+			if self.writer == ident:
+				self.writerDepth += 1
+				return
+			if ident in self.readers:
+				raise RuntimeError("Upgrade of a read-lock to the write-lock isn't possible")
+			self.waitingWriters += 1
+			try:
+				while self.writer != None or self.readers:
+					self.condition.wait()
+			finally:
+				self.waitingWriters -= 1
+			self.writer = ident
+			self.writerDepth = 1
+			self.writeCount += 1
+
+	def releaseWrite(self):
+		with self.condition:
+			self.writerDepth -= 1
+			if self.writerDepth == 0:
+				self.writer = None
+				self.condition.notify_all()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+from threading import Lock
+from time import time, strftime
+import os
+
+# upper bounds of the buckets of the histograms in milliseconds, the last bucket is open
+HISTOGRAM_BUCKETS = (0.01, 0.1, 1, 10, 100, 1000, 10000)
+
+"""
+Latency-histogram of one operation, the durations are observed in seconds and reported in milliseconds
+"""
+class XMLConfigHistogram:
+	def __init__(self):
+		self.count = 0
+		self.total = 0.0
+		self.min = None
+		self.max = 0.0
+		self.buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+
+	def observe(self, duration):
+		duration *= 1000.0
+		self.count += 1
+		self.total += duration
+		if self.min == None or duration < self.min:
+			self.min = duration
+		if duration > self.max:
+			self.max = duration
+		for i, bound in enumerate(HISTOGRAM_BUCKETS):
+			if duration <= bound:
+				self.buckets[i] += 1
+				return
+		self.buckets[-1] += 1
+
+	def getStats(self):
+		buckets = [("<=%gms" % (bound), count) for bound, count in zip(HISTOGRAM_BUCKETS, self.buckets)]
+		buckets.append((">%gms" % (HISTOGRAM_BUCKETS[-1]), self.buckets[-1]))
+		return {"count": self.count, "total": self.total, "min": self.min or 0.0, "max": self.max, \
+			"mean": self.total / self.count if self.count else 0.0, "buckets": buckets}
+
+"""
+Counters and latency-histograms of an instance of XMLConfigSupport, see XMLConfigSupport.getStats
+	they are updated by the main loop and by the background-writer, so they are guarded by a lock
+"""
+class XMLConfigMetrics:
+	def __init__(self):
+		self.lock = Lock()
+		self.startTime = time()
+		self.counters = {}
+		self.histograms = {}
+
+	def add(self, name, value = 1):
+		with self.lock:
+			self.counters[name] = self.counters.get(name, 0) + value
+
+	def observe(self, name, duration):
+		with self.lock:
+			histogram = self.histograms.get(name)
+			if histogram == None:
+				histogram = self.histograms[name] = XMLConfigHistogram()
+			histogram.observe(duration)
+
+	def reset(self):
+		with self.lock:
+			self.startTime = time()
+			self.counters.clear()
+			self.histograms.clear()
+
+	def getStats(self):
+		with self.lock:
+			return {"since": self.startTime, "counters": dict(self.counters), \
+				"histograms": dict([(name, histogram.getStats()) for name, histogram in self.histograms.iteritems()])}
+
+	"""
+	returns the metrics as text, one line per counter and histogram, e.g. for scraping
+		name:	name of the instance, it is the first column of every line
+	"""
+	def formatStats(self, name):
+		stats = self.getStats()
+		lines = []
+		for counter, value in sorted(stats["counters"].iteritems()):
+			lines.append("%s counter %s %d" % (name, counter, value))
+		for histogram, values in sorted(stats["histograms"].iteritems()):
+			lines.append("%s histogram %s count=%d total=%.3f min=%.3f mean=%.3f max=%.3f %s" \
+				% (name, histogram, values["count"], values["total"], values["min"], values["mean"], values["max"], \
+				" ".join(["%s=%d" % (bucket, count) for bucket, count in values["buckets"]])))
+		return lines
+
+	"""
+	writes the formatted metrics to the file, it is replaced at once, so readers never see a part
+	"""
+	def dumpToFile(self, dumpFile, name):
+		tmpFile = dumpFile + ".tmp"
+		with open(tmpFile, 'w') as out:
+			out.write("# %s metrics at %s\n" % (name, strftime("%Y-%m-%d %H:%M:%S")))
+			out.write("\n".join(self.formatStats(name)) + "\n")
+		os.rename(tmpFile, dumpFile)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+"""
+creates the __slots__ of the class from its declared fields, see XMLConfigObject
+"""
+class XMLConfigObjectMeta(type):
+	def __new__(meta, className, bases, classDict):
+		inherited = ()
+		for base in bases:
+			inherited += getattr(base, "_fieldNames", ())
+		fieldNames = list(inherited)
+		defaults = {}
+		for base in bases:
+			defaults.update(getattr(base, "_defaults", {}))
+		slots = []
+		for fieldName, default in classDict.get("fields", ()):
+			if not fieldName in fieldNames:
+				fieldNames.append(fieldName)
+				slots.append(fieldName)
+			defaults[fieldName] = default
+		classDict["__slots__"] = tuple(slots) + tuple(classDict.get("__slots__", ()))
+		classDict["_fieldNames"] = tuple(fieldNames)
+		classDict["_defaults"] = defaults
+		# mutable defaults are copied for every object
+		classDict["_mutableFields"] = tuple([fieldName for fieldName in fieldNames \
+			if isinstance(defaults[fieldName], (list, dict, set))])
+		return type.__new__(meta, className, bases, classDict)
+
+"""
+Compact base class for the objectClass of XMLConfigSupport
+	the objects have no __dict__, the attributes are stored in __slots__, which are created from "fields"
+	"fields" is a tuple of (name, default)-tuples, the fields of the base classes are inherited
+	"key", "name" and "enabled" are already declared, like expected by the screens
+	attributes which aren't declared can't be set, add them to the fields
+
+	class Timer(XMLConfigObject):
+		fields = (("begin", 0), ("end", 0), ("services", []))
+
+	the fields can be given as keyword-arguments: Timer(key = "1", name = "News", begin = 1200)
+"""
+class XMLConfigObject(object):
+	__metaclass__ = XMLConfigObjectMeta
+	fields = (("key", ""), ("name", ""), ("enabled", True))
+
+	def __init__(self, **values):
+		defaults = self._defaults
+		for fieldName in self._fieldNames:
+			setattr(self, fieldName, defaults[fieldName])
+		for fieldName in self._mutableFields:
+			setattr(self, fieldName, type(defaults[fieldName])(defaults[fieldName]))
+		for fieldName, value in values.iteritems():
+			setattr(self, fieldName, value)
+
+	def __repr__(self):
+		return "%s(%s)" % (self.__class__.__name__, \
+			", ".join(["%s=%r" % (fieldName, getattr(self, fieldName)) for fieldName in self._fieldNames]))
+
+	# the state is stored as tuple, it is smaller than a dict (e.g. in the snapshot-cache)
+	def __getstate__(self):
+		return tuple([getattr(self, fieldName) for fieldName in self._fieldNames])
+
+	def __setstate__(self, state):
+		for fieldName, value in zip(self._fieldNames, state):
+			setattr(self, fieldName, value)
+
+	"""
+	returns a shallow copy of the object, the values of mutable fields are copied too
+		e.g. to edit an object without changing the stored one
+	"""
+	def copy(self):
+		object = self.__class__.__new__(self.__class__)
+		for fieldName in self._fieldNames:
+			setattr(object, fieldName, getattr(self, fieldName))
+		for fieldName in self._mutableFields:
+			value = getattr(self, fieldName)
+			setattr(object, fieldName, type(value)(value))
+		return object
+
+	"""
+	returns the values of all fields as dict
+	"""
+	def toDict(self):
+		return dict([(fieldName, getattr(self, fieldName)) for fieldName in self._fieldNames])
+
+	"""
+	called by the editor before saving, returns the error-messages as text, or None if the object is valid
+		overwrite it to check the values of your object
+	"""
+	def checkAll(self, session):
+		return None
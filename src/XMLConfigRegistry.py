@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+from traceback import format_exc
+
+from XMLConfigTools import ERROR_LEVEL, WARN_LEVEL, DEBUG_LEVEL, getGeneralLogger
+
+# count of objects, which are measured to estimate the memory of all objects
+MEMORY_SAMPLE_SIZE = 100
+
+"""
+Process-wide registry of shared XMLConfigSupport-instances, see getSharedXMLConfigSupport
+	all consumers of the same (xml-file, xmlNode, objectClass) get the same instance,
+	so the file is parsed and the objects are kept only once
+	the instance is released with releaseSharedXMLConfigSupport, the last release writes the
+	"unsafed" changes and stops its threads
+	the consumers share the configuration of the instance, it should be adjusted only once after creating it
+"""
+class XMLConfigRegistry:
+	def __init__(self):
+		# (path, xmlNode, objectClass) -> [instance, count of references]
+		self.entries = {}
+		self.createCount = 0
+		self.shareCount = 0
+
+	def acquire(self, supportClass, xmlFilePath, xmlNodeName, objectClass, **kwargs):
+		key = (os.path.abspath(xmlFilePath), xmlNodeName, objectClass)
+		entry = self.entries.get(key)
+		if entry == None:
+			entry = self.entries[key] = [supportClass(xmlFilePath, xmlNodeName, objectClass, **kwargs), 0]
+			self.createCount += 1
+		else:
+			if not isinstance(entry[0], supportClass):
+				getGeneralLogger().printOut("Shared instance for \"%s\" is a %s, not a %s!", \
+					key[0], entry[0].__class__.__name__, supportClass.__name__, level = WARN_LEVEL)
+			self.shareCount += 1
+		entry[1] += 1
+		return entry[0]
+
+	"""
+	returns False if the instance isn't registered
+	"""
+	def release(self, instance):
+		for key, entry in self.entries.items():
+			if entry[0] is instance:
+				entry[1] -= 1
+				if entry[1] <= 0:
+					del self.entries[key]
+					self._shutdown(instance)
+				return True
+		return False
+
+	def _shutdown(self, instance):
+		try:
+			instance.writeXmlIfNeeded()
+			if instance.backgroundWriter != None:
+				instance.adjustBackgroundWriter(False)
+			if instance.watcher != None:
+				instance.watcher.stop()
+				instance.watcher = None
+			instance.log.printOut("Shared instance for \"%s\" released.", instance.XML_CONFIG, level = DEBUG_LEVEL)
+		except:
+			instance.log.printOut("XMLConfigRegistry-Error:\n%s", format_exc, level = ERROR_LEVEL)
+
+	"""
+	returns the counts of instances and references, and what the sharing saved:
+		the loads of the xml-files and the memory of the objects (estimated in bytes), which the consumers
+		would have needed with own instances
+	"""
+	def getStats(self):
+		references = loadsSaved = objectsShared = memorySaved = 0
+		for instance, count in self.entries.itervalues():
+			references += count
+			loadsSaved += instance.loadCount * (count - 1)
+			objectsShared += len(instance.objects) * (count - 1)
+			memorySaved += self._estimateMemory(instance) * (count - 1)
+		return {"instances": len(self.entries), "references": references, "created": self.createCount, \
+			"shared": self.shareCount, "loadsSaved": loadsSaved, "objectsShared": objectsShared, \
+			"memorySaved": memorySaved}
+
+	def _estimateMemory(self, instance):
+		objects = instance.objects
+		if not objects:
+			return 0
+		size = 0
+		sampleCount = 0
+		for object in objects.itervalues():
+			size += sys.getsizeof(object)
+			for value in getattr(object, "__dict__", {}).itervalues():
+				size += sys.getsizeof(value)
+			if hasattr(object, "__dict__"):
+				size += sys.getsizeof(object.__dict__)
+			for fieldName in getattr(object, "_fieldNames", ()):
+				size += sys.getsizeof(getattr(object, fieldName, None))
+			sampleCount += 1
+			if sampleCount >= MEMORY_SAMPLE_SIZE:
+				break
+		return size * len(objects) / sampleCount
+
+registry = XMLConfigRegistry()
+
+"""
+returns the shared instance of supportClass (XMLConfigSupport or a subclass) for the xml-file, see XMLConfigRegistry
+	the arguments are the ones of XMLConfigSupport, they are only used to create the instance
+"""
+def getSharedXMLConfigSupport(supportClass, xmlFilePath, xmlNodeName, objectClass, **kwargs):
+	return registry.acquire(supportClass, xmlFilePath, xmlNodeName, objectClass, **kwargs)
+
+def releaseSharedXMLConfigSupport(instance):
+	return registry.release(instance)
+
+def getSharedXMLConfigStats():
+	return registry.getStats()
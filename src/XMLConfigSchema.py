@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+from XMLConfigSerializer import escapeXml
+
+"""
+Codecs convert the value of a xml-attribute, see XMLConfigField
+	they only provide the code for the parse- and format-functions, which are generated by XMLConfigSchema
+	parseCode:	expression which converts the string "value", it may raise ValueError or KeyError
+	formatCode:	expression which converts the python-value "value" into an escaped string,
+				which is inserted with the placeholder formatSpec, unicode has to be encoded as utf-8
+				(escape does it), the line of the entry is joined with the other lines as str
+	const:		name of the constant, which is returned by getConstant
+"""
+class XMLConfigStringCodec:
+	default = ""
+	# False, if the parse-expression can't raise an error
+	canFail = False
+	formatSpec = "%s"
+
+	def getConstant(self, boolStrings):
+		return None
+
+	def parseCode(self, value, const):
+		return value
+
+	def formatCode(self, value, const):
+		return "escape(%s)" % (value)
+
+class XMLConfigIntCodec(XMLConfigStringCodec):
+	default = 0
+	canFail = True
+	formatSpec = "%d"
+
+	def parseCode(self, value, const):
+		return "int(%s)" % (value)
+
+	def formatCode(self, value, const):
+		return value
+
+class XMLConfigFloatCodec(XMLConfigStringCodec):
+	default = 0.0
+	canFail = True
+
+	def parseCode(self, value, const):
+		return "float(%s)" % (value)
+
+	def formatCode(self, value, const):
+		return "repr(float(%s))" % (value)
+
+"""
+uses the bool-strings of XMLConfigSupport.adjustBoolString
+"""
+class XMLConfigBoolCodec(XMLConfigStringCodec):
+	default = False
+	canFail = True
+
+	def getConstant(self, boolStrings):
+		trueValue, falseValue = boolStrings
+		return ({trueValue: True, falseValue: False}, escapeXml(trueValue), escapeXml(falseValue))
+
+	def parseCode(self, value, const):
+		return "%s[0][%s]" % (const, value)
+
+	def formatCode(self, value, const):
+		return "(%s[1] if %s else %s[2])" % (const, value, const)
+
+"""
+values:		list of the allowed strings, or of (xml-value, python-value)-tuples
+the default is the first value
+"""
+class XMLConfigEnumCodec(XMLConfigStringCodec):
+	canFail = True
+
+	def __init__(self, values):
+		self.values = [value if isinstance(value, tuple) else (value, value) for value in values]
+		self.default = self.values[0][1]
+
+	def getConstant(self, boolStrings):
+		return (dict(self.values), dict([(value, escapeXml(xmlValue)) for xmlValue, value in self.values]))
+
+	def parseCode(self, value, const):
+		return "%s[0][%s]" % (const, value)
+
+	def formatCode(self, value, const):
+		return "%s[1][%s]" % (const, value)
+
+"""
+list of values within one attribute
+	itemCodec:		codec of the items, string, int or float
+	separator:		string between the items, empty items are skipped
+"""
+class XMLConfigListCodec(XMLConfigStringCodec):
+	default = []
+	canFail = True
+
+	def __init__(self, itemCodec = None, separator = ","):
+		self.itemCodec = itemCodec if itemCodec != None else XMLConfigStringCodec()
+		self.separator = separator
+
+	def getConstant(self, boolStrings):
+		return self.separator
+
+	def parseCode(self, value, const):
+		return "[%s for item in %s.split(%s) if item]" % (self.itemCodec.parseCode("item", None), value, const)
+
+	def formatCode(self, value, const):
+		if isinstance(self.itemCodec, (XMLConfigIntCodec, XMLConfigFloatCodec)) and escapeXml(self.separator) == self.separator:
+			return "%s.join([%s for item in %s])" % (const, self._formatItemCode(), value)
+		elif isinstance(self.itemCodec, (XMLConfigIntCodec, XMLConfigFloatCodec)):
+			return "escape(%s.join([%s for item in %s]))" % (const, self._formatItemCode(), value)
+		# the items are escaped with the joined string
+		return "escape(%s.join(%s))" % (const, value)
+
+	def _formatItemCode(self):
+		if isinstance(self.itemCodec, XMLConfigIntCodec):
+			return "str(item)"
+		return "repr(float(item))"
+
+"""
+Declaration of one attribute of the objects
+	name:			name of the attribute of the object
+	[codec]:		codec of the value, default: XMLConfigStringCodec
+	[xmlAttr]:		name of the xml-attribute, default: name
+	[default]:		value if the xml-attribute is missing or invalid, default: the default of the codec
+					if it is None, the xml-attribute is skipped while writing, if the value is None
+"""
+class XMLConfigField:
+	NO_DEFAULT = object()
+
+	def __init__(self, name, codec = None, xmlAttr = None, default = NO_DEFAULT):
+		self.name = name
+		self.codec = codec if codec != None else XMLConfigStringCodec()
+		self.xmlAttr = xmlAttr if xmlAttr != None else name
+		self.default = default if default is not XMLConfigField.NO_DEFAULT else self.codec.default
+
+"""
+Compiles the fields once into a parse- and a format-function, see XMLConfigSupport.adjustSchema
+	the functions are generated as python-code, so there is no dispatch per field while parsing and writing
+	only the attributes of the xml-node are handled, nested elements need an own parseEntry and serializeEntry
+
+xmlNode:			XML-Node which represent the stored object
+fields:				list of XMLConfigField
+objectClass:		class of the objects, it is created without arguments
+boolStrings:		tuple of the xml-values for True and False
+invalidFunc:		function(xmlAttr, value, default) which is called for invalid values and returns the used value
+"""
+class XMLConfigSchema:
+	def __init__(self, xmlNode, fields, objectClass, boolStrings, invalidFunc):
+		self.xmlNode = xmlNode
+		self.fields = fields
+		namespace = {"objectClass": objectClass, "invalid": invalidFunc, "escape": escapeXml}
+		parseLines = ["\tget = element.get", "\tobject = objectClass()"]
+		formatParts = []
+		formatValues = []
+		for i, field in enumerate(fields):
+			const = "c%d" % (i)
+			default = "d%d" % (i)
+			namespace[const] = field.codec.getConstant(boolStrings)
+			namespace[default] = field.default
+			if isinstance(field.default, (list, dict, set)):
+				default = "type(%s)(%s)" % (default, default)
+
+			parseLines.append("\tvalue = get(%r)" % (field.xmlAttr))
+			parseLines.append("\tif value == None:")
+			parseLines.append("\t\tobject.%s = %s" % (field.name, default))
+			if field.codec.canFail:
+				parseLines.append("\telse:")
+				parseLines.append("\t\ttry:")
+				parseLines.append("\t\t\tobject.%s = %s" % (field.name, field.codec.parseCode("value", const)))
+				parseLines.append("\t\texcept (ValueError, KeyError):")
+				parseLines.append("\t\t\tobject.%s = invalid(%r, value, %s)" % (field.name, field.xmlAttr, default))
+			else:
+				parseLines.append("\telse:")
+				parseLines.append("\t\tobject.%s = %s" % (field.name, field.codec.parseCode("value", const)))
+
+			value = "object.%s" % (field.name)
+			if field.default == None:
+				formatParts.append("%s")
+				formatValues.append("((' %s=\"%s\"' %% %s) if %s != None else '')" \
+					% (field.xmlAttr, field.codec.formatSpec, field.codec.formatCode(value, const), value))
+			else:
+				formatParts.append(" %s=\"%s\"" % (field.xmlAttr, field.codec.formatSpec))
+				formatValues.append(field.codec.formatCode(value, const))
+		parseLines.append("\treturn object")
+
+		entryFormat = "\t<%s%s />\n" % (xmlNode, "".join(formatParts))
+		formatLines = ["\treturn %r %% (%s,)" % (entryFormat, ", ".join(formatValues))]
+		if not formatValues:
+			formatLines[0] = "\treturn %r" % (entryFormat)
+		# the constants are bound as default-arguments, locals are faster than the globals of the namespace
+		constants = ", ".join(["%s = %s" % (name, name) for name in sorted(namespace)])
+		parseLines.insert(0, "def parse(element, %s):" % (constants))
+		formatLines.insert(0, "def format(object, %s):" % (constants))
+
+		self.source = "\n".join(parseLines + [""] + formatLines) + "\n"
+		exec compile(self.source, "<XMLConfigSchema %s>" % (xmlNode), "exec") in namespace
+		# parse(xmlElement) returns the object, format(object) returns its line of the xml-file
+		self.parse = namespace["parse"]
+		self.format = namespace["format"]
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+import re
+
+_xmlEscapeTable = {
+	"&": "&amp;",
+	"<": "&lt;",
+	">": "&gt;",
+	"'": "&apos;",
+	"\"": "&quot;",
+}
+_xmlEscapeRegex = re.compile("[&<>'\"]")
+# escaped values of short strings, e.g. bool-strings or names, are reused
+_escapeCache = {}
+ESCAPE_CACHE_SIZE = 4096
+ESCAPE_CACHE_MAX_LENGTH = 64
+
+def _replaceXmlChar(match):
+	return _xmlEscapeTable[match.group(0)]
+
+"""
+returns the string escaped for the use in xml, like stringToXML
+	unicode (e.g. non-ascii values parsed by cElementTree) is returned encoded as utf-8,
+	so it can be joined with the other parts of the document and written to a file
+"""
+def escapeXml(text):
+	escaped = _escapeCache.get(text)
+	if escaped == None:
+		if _xmlEscapeRegex.search(text):
+			escaped = _xmlEscapeRegex.sub(_replaceXmlChar, text)
+		else:
+			escaped = text
+		if isinstance(escaped, unicode):
+			escaped = escaped.encode("utf-8")
+		if len(text) <= ESCAPE_CACHE_MAX_LENGTH:
+			if len(_escapeCache) >= ESCAPE_CACHE_SIZE:
+				_escapeCache.clear()
+			_escapeCache[text] = escaped
+	return escaped
+
+"""
+returns unicode encoded as utf-8, other strings unchanged
+"""
+def encodeUtf8(text):
+	if isinstance(text, unicode):
+		return text.encode("utf-8")
+	return text
+
+"""
+Writes a xml-document entry by entry into a file (or any object providing write)
+	the output is collected in a buffer, and written if it exceeds bufferSize
+	the document is written as utf-8, unicode-values are encoded before they are joined with the others
+
+sink:				the file to write to
+rootNode:			name of the root-node
+[rootAttributes]:	list of (name, value)-tuples for the root-node
+[boolStrings]:		tuple of the xml-values for True and False
+[bufferSize]:		size of the buffer in bytes
+"""
+class XMLConfigSerializer:
+	def __init__(self, sink, rootNode, rootAttributes = None, boolStrings = ("yes", "no"), \
+			bufferSize = 65536):
+		self.sink = sink
+		self.rootNode = rootNode
+		self.rootAttributes = rootAttributes
+		self.trueValue, self.falseValue = boolStrings
+		self.bufferSize = bufferSize
+		self.buffer = []
+		self.bufferLength = 0
+		self.entryCount = 0
+		self.bytesWritten = 0
+
+	def startDocument(self):
+		self._write("<?xml version=\"1.0\" encoding=\"utf-8\" ?>\n<%s%s>\n" \
+			% (encodeUtf8(self.rootNode), self._formatAttributes(self.rootAttributes)))
+
+	def endDocument(self):
+		self._write("</%s>\n" % (encodeUtf8(self.rootNode)))
+		self.flush()
+
+	"""
+	writes one entry
+		attributes:	list of (name, value)-tuples, the values have to be strings, None-values are skipped
+		content:	already serialized xml, which is placed inside of the entry
+	"""
+	def writeEntry(self, node, attributes, content = None):
+		node = encodeUtf8(node)
+		if content:
+			content = encodeUtf8(content)
+			self._write("\t<%s%s>%s</%s>\n" % (node, self._formatAttributes(attributes), content, node))
+		else:
+			self._write("\t<%s%s />\n" % (node, self._formatAttributes(attributes)))
+		self.entryCount += 1
+
+	"""
+	writes one entry, which is already serialized, e.g. by XMLConfigSchema
+	"""
+	def writeEntryXml(self, xml):
+		self._write(xml)
+		self.entryCount += 1
+
+	def flush(self):
+		if self.buffer:
+			data = "".join(self.buffer)
+			self.sink.write(data)
+			self.bytesWritten += len(data)
+			self.buffer = []
+			self.bufferLength = 0
+
+	# helpers to convert the attribute-values
+	def formatBool(self, value):
+		if value:
+			return self.trueValue
+		return self.falseValue
+
+	def formatInt(self, value):
+		return str(int(value))
+
+	def formatFloat(self, value):
+		return repr(float(value))
+
+	def formatList(self, values, separator = ","):
+		return separator.join([str(value) for value in values])
+
+	# internal functions
+	def _formatAttributes(self, attributes):
+		if not attributes:
+			return ""
+		return "".join([" %s=\"%s\"" % (name, escapeXml(value)) for name, value in attributes if value != None])
+
+	def _write(self, data):
+		if isinstance(data, unicode):
+			data = data.encode("utf-8")
+		self.buffer.append(data)
+		self.bufferLength += len(data)
+		if self.bufferLength >= self.bufferSize:
+			self.flush()
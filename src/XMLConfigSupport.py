@@ -1,15 +1,67 @@
 # -*- coding: utf-8 -*-
 
 # XML-Config
-from xml.etree.cElementTree import parse as cet_parse
-from Tools.XMLTools import stringToXML
+from xml.etree.cElementTree import parse as cet_parse, iterparse as cet_iterparse, tostring as cet_tostring, \
+	fromstring as cet_fromstring
+from hashlib import md5
+from zlib import adler32, crc32
+import cPickle
 import os
+import re
+import resource
+from shutil import copymode
+from StringIO import StringIO
+from tempfile import mkstemp
+from time import time
 
 # Plugin
-from Tools.BoundFunction import boundFunction
+from functools import partial
+from itertools import count
+from threading import Lock
 from traceback import format_exc
 
 from XMLConfigTools import PLUGIN_VERSION, ERROR_LEVEL, WARN_LEVEL, DEBUG_LEVEL, getGeneralLogger
+from XMLConfigWriter import XMLConfigWriter
+from XMLConfigSerializer import XMLConfigSerializer
+from XMLConfigBatch import XMLConfigBatch
+from XMLConfigLazy import XMLConfigLazyObjects
+from XMLConfigSchema import XMLConfigSchema
+from XMLConfigWatcher import XMLConfigWatcher
+from XMLConfigLock import XMLConfigLock, XMLConfigLockTimeout, XMLConfigRWLock
+from XMLConfigMetrics import XMLConfigMetrics
+from XMLConfigIndex import XMLConfigHashIndex, XMLConfigOrderedIndex, XMLConfigSortedView, \
+	XMLConfigQuery, SORTED_VIEW_KEYS
+
+# durability of written xml-files, see adjustWriteDurability
+DURABILITY_NONE = 0
+DURABILITY_FILE = 1
+DURABILITY_DIRECTORY = 2
+
+# handling of writes, if the standard-file was changed by someone else since the last read, see adjustLocking
+CONFLICT_FAIL = 0
+CONFLICT_MERGE = 1
+
+# from this count on, writeConfigToRam builds the indexes and sorted views once, instead of updating them per object,
+# an update moves the following entries of the sorted lists, a build computes all values and sorts once
+BULK_LOAD_MIN_OBJECTS = 1000
+
+# methods which are called within the write-lock (True) or the read-lock (False), see adjustThreadSafe
+# readXml and writeXml take the locks by themselves, see _getConcurrentReadXml and _getConcurrentWriteXml
+THREAD_SAFE_METHODS = {
+	"writeConfigToRam": True, "_writeSnapshot": True, "_commitXmlObjects": True,
+	"invalidateXML": True, "setWriteXMLNeeded": True, "setObjectOperationForbidden": True,
+	"clear": True, "add": True, "remove": True, "removeObject": True, "_editorCallback": True,
+	"getSortedTupleList": True, "getSortedView": True, "addIndex": True, "removeIndex": True,
+	"exists": False, "get": False, "getObjectList": False, "diffObjects": False, "getIndexStats": False, "getStats": False,
+}
+
+# umask of the process, new files get the mode of open(), instead of the 0600 of mkstemp
+_umask = os.umask(0)
+os.umask(_umask)
+
+# first start-tag of a xml-file, which is the root-node
+_rootTagRegex = re.compile(r"<(?![?!])([^\s/>]+)([^>]*)>")
+_generationRegex = re.compile(r"\sgeneration\s*=\s*[\"'](\d+)[\"']")
 
 """
 General Support for objects, which should be stored on system via xml
@@ -18,10 +70,10 @@ xmlFilePath:			absolute Path to the xml-file on system
 xmlNodeName:			XML-Node which represent the stored object
 objectClass:			Class which represent the stored object
 						It have to provide an attribute "key", and should be provide attributes "name" and "enabled" to use the Screens
+						You can inherit from XMLConfigObject, to store the attributes compact in __slots__
 objectEditorClass:		Screen-Class to edit the stored object (you can inherit from the class ConfigEditor)
 objectSelectClass:		Screen-Class to select one or more stored objects (you can inherit from the class ConfigSelect)
-[supportName]:			identifier for output-Strings, for the logger, 
-						it isn't necessary if you provide an own loggerinstance
+[supportName]:			identifier for output-Strings, the prefix of the log-messages of the instance
 [loggerinstance]:		Instance of a General-Logger from System-Plugin
 Only needed, if you want to use the screens
 objectSingular			Singular-Name of your object
@@ -44,23 +96,405 @@ class XMLConfigSupport:
 		self.xmlNode = xmlNodeName
 		self.XML_CONFIG = xmlFilePath
 		self.xmlBool = {}
+		self.streamingLoad = False
+		self.incrementalReload = False
+		self.writeDurability = DURABILITY_FILE
+		self.backgroundWriter = None
+		self.xmlRootNode = None
+		self.xmlRootAttributes = None
+		self.snapshotCacheFile = None
+		self.snapshotCacheHits = 0
+		self.snapshotCacheMisses = 0
+		self.journalFile = None
+		self.journalMaxSize = 0
+		self.journalMaxAge = 0
+		self.shardCount = 0
+		# keys of the objects of every shard
+		self.shardKeys = []
+		self.dirtyShards = set()
+		self.shardFingerprints = {}
+		self.currentBatch = None
+		self.lazyKeyAttribute = None
+		self.lazyCacheSize = 0
+		# key -> digest of the xml-entry, only for objects unchanged since loading
+		self.entryDigests = {}
+		# name -> secondary index
+		self.indexes = {}
+		# name -> sorted view, created on the first use
+		self.sortedViews = {}
+		# >0 while many objects are loaded, the indexes and sorted views are built afterwards, see _beginBulkLoad
+		self.bulkLoadDepth = 0
+		self.indexesOutdated = False
+		self.schemaFields = None
+		self.schema = None
+		self.watcher = None
+		self.watcherAutoReload = False
+		self.configFileChanged = False
+		# mtime of the standard-file after the last write of ram, to ignore the own changes
+		self.writtenConfigMtime = None
+		# functions without arguments, which are called if the standard-file was changed by someone else
+		self.onConfigChanged = []
+		self.configLock = None
+		self.conflictMode = CONFLICT_FAIL
+		# generation of the standard-file at the last read or write
+		self.loadedGeneration = 0
+		# size of the journal at the last read, write or append, the appends of others change it
+		self.loadedJournalSize = 0
+		# keys of the objects, which were changed in ram since then, only tracked with locking
+		self.unsavedKeys = set()
+		self.loadingConfig = False
+		# count of loads of the standard-file, which weren't skipped as unchanged
+		self.loadCount = 0
+		self.threadLock = None
+		# counts the changes of ram, a write clears writeXMLNeeded only if ram wasn't changed meanwhile
+		self.changeCount = 0
+		self.metrics = XMLConfigMetrics()
+		self.detailedMetrics = False
+		self.metricsDumpInterval = 0
+		self.metricsDumpFile = None
+		self.nextMetricsDump = 0
 		
 		self.objectSingular = objectSingular
 		self.objectSingularArticle = objectSingularArticle
 		self.objectPlural = objectPlural
 		self.objectPluralArticle = objectPluralArticle
 		
-		self.log = loggerInstance
-		if self.log == None:
-			self.log = getGeneralLogger(additionalPrefix = supportName)
+		self.log = getGeneralLogger(additionalPrefix = supportName, loggerInstance = loggerInstance)
 		
 		# Defaults
 		self.adjustBoolString("yes", "no")
 	
 	# functions to configure
+	"""
+	To configure the metrics of the instance, see getStats
+		detailed:		measure every parseEntry and every call of the hooks (objectLoaded, objectAdded, objectOverwritten),
+						it costs two calls of time() per entry
+		[dumpInterval]:	seconds between two dumps of the metrics, 0 disables the dump,
+						the metrics are dumped after readXml or writeXml, if the interval has passed
+		[dumpFile]:		path of a text-file (e.g. under /tmp), which is replaced by every dump,
+						default: the dump is written by the logger
+	"""
+	def adjustMetrics(self, detailed, dumpInterval = 0, dumpFile = None):
+		self.detailedMetrics = detailed
+		self.metricsDumpInterval = dumpInterval
+		self.metricsDumpFile = dumpFile
+		self.nextMetricsDump = time() + dumpInterval
+	
 	def adjustBoolString(self, trueValue, falseValue):
 		self.xmlBool["TRUE"] = trueValue
 		self.xmlBool["FALSE"] = falseValue
+		if self.schemaFields != None:
+			self.adjustSchema(self.schemaFields)
+	"""
+	To load the standard-file entry by entry, instead of parsing the whole tree first
+		the objects are added directly to ram, so the peak memory stays low for large files
+		only usable if xmlNodeName is a direct child of the root-node
+	"""
+	def adjustStreamingLoad(self, enabled):
+		self.streamingLoad = enabled
+	"""
+	To reload only the changed entries of the standard-file, instead of clearing and parsing all objects
+		the objects of unchanged entries are kept, the hooks are only called for added or changed entries
+	"""
+	def adjustIncrementalReload(self, enabled):
+		self.incrementalReload = enabled
+		self.entryDigests.clear()
+	"""
+	To configure how the written xml-files are synced to disk, they are always replaced atomically
+		DURABILITY_NONE:		no fsync, the system decides when the data reaches the flash
+		DURABILITY_FILE:		fsync of the file before replacing the old one (default)
+		DURABILITY_DIRECTORY:	additional fsync of the directory, so the rename survives a power cut
+	"""
+	def adjustWriteDurability(self, durability):
+		self.writeDurability = durability
+	"""
+	To write the xml-file entry by entry with the streaming serializer, instead of getXml
+		rootNodeName:		name of the root-node of the xml-file
+		[rootAttributes]:	list of (name, value)-tuples for the root-node
+		you have to implement serializeEntry
+	"""
+	def adjustXmlRootNode(self, rootNodeName, rootAttributes = None):
+		self.xmlRootNode = rootNodeName
+		self.xmlRootAttributes = rootAttributes
+	"""
+	To parse and write the objects by a declaration of their attributes, instead of implementing
+	parseEntry and serializeEntry, see XMLConfigSchema
+		fields:		list of XMLConfigField, None to disable the schema
+		the schema is compiled once into a parse- and a format-function, with the current bool-strings
+		use adjustXmlRootNode to write the objects with the schema
+	"""
+	def adjustSchema(self, fields):
+		self.schemaFields = fields
+		if fields == None:
+			self.schema = None
+		else:
+			self.schema = XMLConfigSchema(self.xmlNode, fields, self.objectClass, \
+				(self.xmlBool["TRUE"], self.xmlBool["FALSE"]), self._invalidValue)
+	"""
+	To store the parsed objects of the standard-file in a binary cache-file beside it,
+	which is loaded instead of parsing the xml-file, as long as the xml-file isn't changed
+		[cacheFile]:	path of the cache-file, default: the xml-file with the extension ".cache"
+		the objects have to be picklable
+	"""
+	def adjustSnapshotCache(self, enabled, cacheFile = None):
+		if enabled:
+			if cacheFile == None:
+				cacheFile = os.path.splitext(self.XML_CONFIG)[0] + ".cache"
+			self.snapshotCacheFile = cacheFile
+		else:
+			self.snapshotCacheFile = None
+	"""
+	To append the changes of addObject and removeObject to a journal-file beside the standard-file,
+	instead of writing the whole xml-file. The journal is replayed by readXml, and compacted into
+	the xml-file if it exceeds maxSize (bytes) or maxAge (seconds)
+		[journalFile]:	path of the journal-file, default: the xml-file with the extension ".journal"
+		while the journal is enabled, writeXml writes the standard-file without the background-writer
+	"""
+	def adjustJournal(self, enabled, journalFile = None, maxSize = 65536, maxAge = 86400):
+		if enabled:
+			if journalFile == None:
+				journalFile = os.path.splitext(self.XML_CONFIG)[0] + ".journal"
+			self.journalFile = journalFile
+			self.journalMaxSize = maxSize
+			self.journalMaxAge = maxAge
+		else:
+			self.journalFile = None
+	"""
+	To spread the objects of the standard-file over shardCount xml-files, by the hash of their keys
+		writeXml writes only the shards with changed objects, readXml reads only the changed shard-files
+		if no shard-file exists, the standard-file is read once and the shards are written by the next writeXml
+		export and import use single xml-files as before, 0 disables the sharding
+		the shards are not combined with the other load- and write-modes
+	"""
+	def adjustSharding(self, shardCount):
+		self.shardCount = shardCount
+		self.shardKeys = [set() for shard in range(shardCount)]
+		for key in self.objects:
+			self.shardKeys[self._getShard(key)].add(key)
+		self.dirtyShards = set(range(shardCount))
+		self.shardFingerprints = {}
+	"""
+	To parse the objects of the standard-file only on their first access, see XMLConfigLazyObjects
+		keyAttribute:	XML-Attribute which contains the key of the object
+		cacheSize:		count of parsed objects, which are kept in ram
+	the objects are replaced by a dict-like object, the hook objectLoaded isn't called while loading,
+	changes of an object have to be stored with add or addObject, indexes and sorted views parse all objects
+	"""
+	def adjustLazyLoad(self, enabled, keyAttribute = "key", cacheSize = 1000):
+		if enabled:
+			self.lazyKeyAttribute = keyAttribute
+			self.lazyCacheSize = cacheSize
+		else:
+			self.lazyKeyAttribute = None
+			if isinstance(self.objects, XMLConfigLazyObjects):
+				objects = dict(self.objects.iteritems())
+				self.objects.close()
+				self.objects = objects
+		self.invalidateXML()
+	"""
+	To watch the standard-file (and the journal) via inotify, instead of checking its mtime on every readXml
+		readXml parses the file only after it was changed, without any stat-calls in between
+		[autoReload]:	reload the objects as soon as the file was changed by someone else,
+						otherwise it is reloaded by the next readXml
+		the functions in onConfigChanged are called on the main loop for every change by someone else
+		if the watch breaks, readXml falls back to the mtime-checks, not usable with the sharding
+	"""
+	def adjustWatcher(self, enabled, autoReload = False):
+		if self.watcher != None:
+			self.watcher.stop()
+			self.watcher = None
+		self.watcherAutoReload = autoReload
+		if enabled:
+			files = [self.XML_CONFIG]
+			if self.journalFile != None:
+				files.append(self.journalFile)
+			self.watcher = XMLConfigWatcher(files, self._onConfigFileChanged, self.log)
+			if not self.watcher.start():
+				self.watcher = None
+		# the changes before the watching aren't known
+		self.invalidateXML()
+	"""
+	To share the standard-file with other processes, which use the same locking
+		readXml takes a shared lock, writeXml an exclusive one, on a lock-file beside the standard-file
+		every write increases the generation in the root-node of the standard-file, if it was changed
+		by someone else since the last read, the write of ram is handled by conflictMode:
+			CONFLICT_FAIL:		writeXml returns False, the changes stay "unsafed" in ram
+			CONFLICT_MERGE:		the changes in ram are merged into the objects of the file,
+								for the same key the object in ram wins
+		[lockFile]:		path of the lock-file, default: the xml-file with the extension ".lock"
+		[timeout]:		seconds to wait for the lock
+		while the locking is enabled, writeXml writes the standard-file without the background-writer
+	"""
+	def adjustLocking(self, enabled, conflictMode = CONFLICT_FAIL, lockFile = None, timeout = 2.0):
+		if self.configLock != None:
+			self.configLock.close()
+			self.configLock = None
+		self.conflictMode = conflictMode
+		self.unsavedKeys.clear()
+		if enabled:
+			if lockFile == None:
+				lockFile = os.path.splitext(self.XML_CONFIG)[0] + ".lock"
+			self.configLock = XMLConfigLock(lockFile, timeout)
+		self.invalidateXML()
+	"""
+	To use the instance from several threads, e.g. readXml and writeXml within deferToThread
+		the methods in THREAD_SAFE_METHODS are called within a readers-writer lock, which protects
+		the objects and the state of the file, they wait for each other
+		readXml parses the standard-file without the lock, writeXml writes a snapshot of the objects without it,
+		only the taking into ram and the state of the file are changed within the write-lock,
+		with the load- and write-modes, which keep an own state, they run within the write-lock
+		iterate over getObjectList or getSortedTupleList, which are snapshots, instead of the objects
+		the queries (query().all()) take the read-lock by themselves
+		objects which are changed in place aren't protected, change them with add
+	"""
+	def adjustThreadSafe(self, enabled):
+		if enabled and self.threadLock == None:
+			self.threadLock = XMLConfigRWLock()
+			# the bound methods are wrapped on the instance, so there is no overhead without thread-safety
+			for methodName, exclusive in THREAD_SAFE_METHODS.iteritems():
+				setattr(self, methodName, self._getLockedMethod(getattr(self, methodName), exclusive))
+			self.readXml = self._getConcurrentReadXml(self.readXml)
+			self.writeXml = self._getConcurrentWriteXml(self.writeXml)
+		elif not enabled and self.threadLock != None:
+			for methodName in THREAD_SAFE_METHODS.keys() + ["readXml", "writeXml"]:
+				self.__dict__.pop(methodName, None)
+			self.threadLock = None
+		if self.backgroundWriter != None:
+			self.backgroundWriter.writeFunc = self._writeSnapshot
+
+	def _getLockedMethod(self, method, exclusive):
+		threadLock = self.threadLock
+		if exclusive:
+			def lockedMethod(*args, **kwargs):
+				threadLock.acquireWrite()
+				try:
+					return method(*args, **kwargs)
+				finally:
+					threadLock.releaseWrite()
+		else:
+			def lockedMethod(*args, **kwargs):
+				threadLock.acquireRead()
+				try:
+					return method(*args, **kwargs)
+				finally:
+					threadLock.releaseRead()
+		return lockedMethod
+
+	"""
+	returns readXml for the thread-safe mode, the standard-file is parsed without the lock,
+	clearing and loading ram run within one write-lock
+	"""
+	def _getConcurrentReadXml(self, method):
+		threadLock = self.threadLock
+		def concurrentReadXml(inOutObjectList = None, xmlFile = None, clearExisting = True, \
+				overwriteExisting = False, writeToRam = True):
+			if not writeToRam and not clearExisting:
+				# ram isn't touched, e.g. the read of an import
+				return method(inOutObjectList, xmlFile, clearExisting, overwriteExisting, writeToRam)
+			if xmlFile != None or inOutObjectList != None or not writeToRam or self._usesLoadMode() \
+					or self.streamingLoad or self.watcher != None:
+				threadLock.acquireWrite()
+				try:
+					return method(inOutObjectList, xmlFile, clearExisting, overwriteExisting, writeToRam)
+				finally:
+					threadLock.releaseWrite()
+			
+			startTime = time()
+			self.metrics.add("readXml.calls")
+			fileState = (self.lastConfigMtime, self.writtenConfigMtime)
+			if os.path.exists(self.XML_CONFIG) and self._getConfigMtime() == self.lastConfigMtime:
+				self.log.printOut("No changes in configuration, won't parse!", level = WARN_LEVEL)
+				self.metrics.add("readXml.skipped")
+				return 0
+			try:
+				result = self._parseXmlFile(self.XML_CONFIG, True)
+				# runs within the write-lock, another read or write committed meanwhile is newer than the parsed file
+				cancelFunc = lambda: fileState != (self.lastConfigMtime, self.writtenConfigMtime)
+				return self._commitXmlObjects(result, True, clearExisting, overwriteExisting, cancelFunc)
+			finally:
+				self.metrics.observe("readXml", time() - startTime)
+		return concurrentReadXml
+
+	"""
+	returns writeXml for the thread-safe mode, a snapshot of the objects is taken within the read-lock,
+	and written without the lock, the state of the file is changed within the write-lock afterwards
+		the writes of the file are serialized by fileLock, an older snapshot never replaces a newer one
+	"""
+	def _getConcurrentWriteXml(self, method):
+		threadLock = self.threadLock
+		fileLock = Lock()
+		sequence = count(1)
+		# sequence of the last written snapshot, and of the last one, which changed the state
+		written = [0, 0]
+		def lockedWriteXml(xmlFile, objectList, ignoreObjectOperationForbidden):
+			threadLock.acquireWrite()
+			try:
+				with fileLock:
+					snapshot = next(sequence)
+					written[0] = written[1] = snapshot
+					return method(xmlFile, objectList, ignoreObjectOperationForbidden)
+			finally:
+				threadLock.releaseWrite()
+		def concurrentWriteXml(xmlFile = None, objectList = None, ignoreObjectOperationForbidden = False):
+			if xmlFile != None and objectList != None:
+				# e.g. an export, the state of the standard-file isn't touched
+				return method(xmlFile, objectList, ignoreObjectOperationForbidden)
+			if xmlFile != None or objectList != None or ignoreObjectOperationForbidden or self.objectOperationForbidden \
+					or self.currentBatch != None or self.shardCount > 0 or self.backgroundWriter != None \
+					or self.journalFile != None or self.configLock != None:
+				return lockedWriteXml(xmlFile, objectList, ignoreObjectOperationForbidden)
+			
+			startTime = time()
+			self.metrics.add("writeXml.calls")
+			try:
+				threadLock.acquireRead()
+				try:
+					objectList = self.objects.values()
+					changeCount = self.changeCount
+					snapshot = next(sequence)
+				finally:
+					threadLock.releaseRead()
+				with fileLock:
+					if snapshot < written[0]:
+						# a newer snapshot was written meanwhile
+						return True
+					if not self._writeXmlFile(self.XML_CONFIG, objectList):
+						return False
+					written[0] = snapshot
+					mtime = self._getConfigMtime()
+					self._updateSnapshotCache(objectList)
+				threadLock.acquireWrite()
+				try:
+					if snapshot > written[1]:
+						written[1] = snapshot
+						# ram is the content of the file, it's not read again
+						self.lastConfigMtime = self.writtenConfigMtime = mtime
+						if changeCount == self.changeCount:
+							self.writeXMLNeeded = False
+				finally:
+					threadLock.releaseWrite()
+				return True
+			except:
+				self.log.printOut("writeXml-Error:\n%s", format_exc, level = ERROR_LEVEL)
+				return False
+			finally:
+				self.metrics.observe("writeXml", time() - startTime)
+		return concurrentWriteXml
+	"""
+	To write the standard-file within an own thread, writeXml only queues a snapshot of the objects
+		all requests within debounceTime (seconds) are merged into one write
+		use flushXml to wait for the pending write, e.g. on shutdown
+	"""
+	def adjustBackgroundWriter(self, enabled, debounceTime = 1.0):
+		if enabled:
+			if self.backgroundWriter == None:
+				self.backgroundWriter = XMLConfigWriter(self._writeSnapshot, debounceTime, self.log)
+				self.backgroundWriter.start()
+			else:
+				self.backgroundWriter.debounceTime = debounceTime
+		elif self.backgroundWriter != None:
+			self.backgroundWriter.stop()
+			self.backgroundWriter = None
 	# hooks
 	"""
 	is called before the modifying of an object
@@ -81,19 +515,37 @@ class XMLConfigSupport:
 	# functions you always have to implement
 	"""
 	You have to return a xml as list of strings, with the given objects
+		not needed if you use the streaming serializer (adjustXmlRootNode and serializeEntry)
 	"""
 	def getXml(self, objectList):
+		if self.xmlRootNode != None:
+			xml = StringIO()
+			self.serializeXml(xml, objectList)
+			return [xml.getvalue()]
 		self.log.printOut("You have to implement \"getXml\" to save your objects!", level = ERROR_LEVEL)
 		return None
 	"""
+	You have to write the given object with serializer.writeEntry, if you use the streaming serializer
+		use the format-helpers of the serializer for the attribute-values
+		not needed if you use a schema (adjustSchema)
+	"""
+	def serializeEntry(self, serializer, object):
+		if self.schema != None:
+			serializer.writeEntryXml(self.schema.format(object))
+			return
+		self.log.printOut("You have to implement \"serializeEntry\" to save your objects!", level = ERROR_LEVEL)
+	"""
 	You have to create and return your object, from the given xml-Element
+		not needed if you use a schema (adjustSchema)
 	"""
 	def parseEntry(self, xmlElement):
 		try:
+			if self.schema != None:
+				return self.schema.parse(xmlElement)
 			self.log.printOut("You have to implement \"parseEntry\" to load your objects!", level = ERROR_LEVEL)
 			return self.objectClass()
 		except:
-			self.log.printOut("parseEntry-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("parseEntry-Error:\n%s", format_exc, level = ERROR_LEVEL)
 			return None
 	
 	# main functions
@@ -104,12 +556,30 @@ class XMLConfigSupport:
 	"""
 	def readXml(self, inOutObjectList = None, xmlFile = None, clearExisting = True, 
 			overwriteExisting = False, writeToRam = True):
+		startTime = time()
+		locked = False
 		try:
+			self.metrics.add("readXml.calls")
 			isStandardFile = False
 			if xmlFile == None:
 				xmlFile = self.XML_CONFIG
 				isStandardFile = True
-			self.log.printOut("Read from configuration file: %s" % (str(xmlFile)), level = DEBUG_LEVEL)
+				if self.shardCount > 0 and writeToRam and inOutObjectList == None:
+					return self.readShards()
+			if isStandardFile and self.watcher != None:
+				if self.watcher.notifier == None:
+					self.watcher.poll()
+				if self.watcher.isActive():
+					if not self.configFileChanged and self.lastConfigMtime != -1:
+						self.log.printOut("No changes in configuration, won't parse!", level = WARN_LEVEL)
+						self.metrics.add("readXml.skipped")
+						return 0
+					self.configFileChanged = False
+			self.log.printOut("Read from configuration file: %s", xmlFile, level = DEBUG_LEVEL)
+			if isStandardFile and self.configLock != None:
+				self.configLock.acquire()
+				locked = True
+				self.loadingConfig = True
 			if not os.path.exists(xmlFile) or os.path.getsize(xmlFile) == 0:
 				self.log.printOut("No configuration file present or file is empty!", level = WARN_LEVEL)
 				return -1
@@ -117,54 +587,229 @@ class XMLConfigSupport:
 			# Parse only if modify-time differs from the last saved in ram, 
 			# and only if the file is real-xml-file
 			if isStandardFile:
-				mtime = os.path.getmtime(xmlFile)
-				if mtime == self.lastConfigMtime:
+				mtime = self._getConfigMtime()
+				generation = self._readGeneration(xmlFile) if locked else 0
+				journalSize = self._getJournalSize() if locked else 0
+				# the generation and the journal-size detect changes within the resolution of the mtime
+				if mtime == self.lastConfigMtime and (not locked or (generation == self.loadedGeneration \
+						and journalSize == self.loadedJournalSize)):
 					self.log.printOut("No changes in configuration, won't parse!", level = WARN_LEVEL)
+					self.metrics.add("readXml.skipped")
 					return 0
 				# Save current mtime
 				self.lastConfigMtime = mtime
+				self.loadCount += 1
 	
-			# Parse Config
-			configuration = cet_parse(xmlFile).getroot()
-	
-			# Empty current Entries
-			if clearExisting:
-				self.clear()
+			# the content of ram will be the same as the file
+			isFullLoad = isStandardFile and writeToRam and clearExisting and inOutObjectList == None
+			fingerprint = None
+			counter = -1
+			if self.lazyKeyAttribute != None and isFullLoad:
+				counter = self.lazyLoadConfig(xmlFile)
+			elif self.snapshotCacheFile != None and isFullLoad:
+				fingerprint = self._getFileFingerprint(xmlFile)
+				counter = self._loadSnapshotCache(fingerprint)
+			
+			if counter < 0:
+				if self.incrementalReload and isFullLoad:
+					counter = self.reloadConfigToRam(xmlFile)
+				elif self.streamingLoad and writeToRam and inOutObjectList == None and not "/" in self.xmlNode:
+					counter = self.streamConfigToRam(xmlFile, clearExisting, overwriteExisting)
+				else:
+					# Parse Config
+					configuration = cet_parse(xmlFile).getroot()
 			
-			if inOutObjectList == None:
-				inOutObjectList = []
-			counter = self.parseConfig(configuration, inOutObjectList)
-			if writeToRam:
-				counter = self.writeConfigToRam(inOutObjectList, overwriteExisting)
+					# Empty current Entries
+					if clearExisting:
+						self.clear()
+					
+					if inOutObjectList == None:
+						inOutObjectList = []
+					counter = self.parseConfig(configuration, inOutObjectList)
+					if writeToRam:
+						counter = self.writeConfigToRam(inOutObjectList, overwriteExisting)
+				
+				if fingerprint != None:
+					self._saveSnapshotCache(fingerprint, self.objects.values())
 			
+			if self.journalFile != None and isFullLoad and self.replayJournal() > 0:
+				counter = len(self.objects)
+			if locked and isFullLoad:
+				self.loadedGeneration = generation
+				self.loadedJournalSize = journalSize
+				self.unsavedKeys.clear()
 			return counter
+		except XMLConfigLockTimeout, e:
+			self.log.printOut("%s, reading canceled.", e, level = ERROR_LEVEL)
+			return -1
 		except:
-			self.log.printOut("readXml-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("readXml-Error:\n%s", format_exc, level = ERROR_LEVEL)
 			return -1
+		finally:
+			if locked:
+				self.loadingConfig = False
+				self.configLock.release()
+			self.metrics.observe("readXml", time() - startTime)
+			self._dumpMetricsIfDue()
 	
 	"""
 	gather the parsed objects and returns the count
 	"""
 	def parseConfig(self, configuration, inOutObjectList):
 		counter = 0
+		parseEntry = self._getParseFunc()
 		for xmlObject in configuration.findall(self.xmlNode):
-			xobject = self.parseEntry(xmlObject)
+			xobject = parseEntry(xmlObject)
 			if xobject != None:
 				inOutObjectList.append(xobject)
 				counter += 1
-		self.log.printOut("%d Entries parsed from config-file!" % (counter), level = DEBUG_LEVEL)
+		self.metrics.add("entries.parsed", counter)
+		self.log.printOut("%d Entries parsed from config-file!", counter, level = DEBUG_LEVEL)
 		return counter
 
+	"""
+	parses the xml-file entry by entry and loads the objects directly to ram,
+	every element is cleared right after parsing.
+		returns the count of loaded objects
+	"""
+	def streamConfigToRam(self, xmlFile, clearExisting = True, overwriteExisting = False):
+		startTime = time()
+		if clearExisting:
+			self.clear()
+		
+		counter = 0
+		parsed = 0
+		parseEntry = self._getParseFunc()
+		self._beginBulkLoad()
+		try:
+			for element in self._iterEntryElements(xmlFile):
+				xobject = parseEntry(element)
+				if xobject != None:
+					parsed += 1
+					if self.add(xobject, overwriteExisting):
+						counter += 1
+		finally:
+			self._endBulkLoad()
+		self.metrics.add("entries.parsed", parsed)
+		
+		duration = time() - startTime
+		self.log.printOut("%d Entries parsed, %d Entries loaded in %.3fs (%.0f Entries/s), peak memory %d kB!", \
+			parsed, counter, duration, parsed / duration if duration > 0 else 0, \
+			lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, level = WARN_LEVEL)
+		return counter
+	
+	"""
+	scans the xml-file for the entries, the objects are parsed on their first access
+		returns the count of entries
+	"""
+	def lazyLoadConfig(self, xmlFile):
+		startTime = time()
+		self.clear()
+		if isinstance(self.objects, XMLConfigLazyObjects):
+			self.objects.close()
+		self.objects = XMLConfigLazyObjects(xmlFile, self.xmlNode, self.lazyKeyAttribute, \
+			self._getParseFunc(), self.lazyCacheSize)
+		# clear emptied the indexes and sorted views, they parse all objects again
+		self._rebuildIndexes()
+		self.log.printOut("%d Entries indexed in %.3fs!", len(self.objects), time() - startTime, level = WARN_LEVEL)
+		return len(self.objects)
+	
+	"""
+	compares the entries of the xml-file with the digests of the last load,
+	and parses only the added or changed entries, removed entries are dropped from ram.
+		returns the count of objects in the file
+	"""
+	def reloadConfigToRam(self, xmlFile):
+		if self.streamingLoad and not "/" in self.xmlNode:
+			elements = self._iterEntryElements(xmlFile)
+		else:
+			elements = cet_parse(xmlFile).getroot().findall(self.xmlNode)
+		
+		knownKeys = dict((digest, key) for key, digest in self.entryDigests.iteritems())
+		currentDigests = {}
+		changedObjects = []
+		unchanged = 0
+		parseEntry = self._getParseFunc()
+		for element in elements:
+			digest = self._getEntryDigest(element)
+			key = knownKeys.get(digest)
+			if key != None and not key in currentDigests:
+				currentDigests[key] = digest
+				unchanged += 1
+				continue
+			xobject = parseEntry(element)
+			if xobject != None and not xobject.key in currentDigests:
+				currentDigests[xobject.key] = digest
+				changedObjects.append(xobject)
+		
+		self.metrics.add("entries.parsed", len(changedObjects))
+		removed = [key for key in self.objects if not key in currentDigests]
+		for key in removed:
+			self._removeKey(key)
+		
+		added = 0
+		for xobject in changedObjects:
+			oldObject = self.objects.get(xobject.key)
+			if oldObject != None:
+				self._callHook(self.objectOverwritten, xobject, oldObject)
+				self.add(xobject, True)
+			else:
+				self.add(xobject)
+				added += 1
+		self.entryDigests = currentDigests
+		
+		self.log.printOut("%d Entries reloaded: %d added, %d changed, %d removed, %d unchanged!", \
+			len(currentDigests), added, len(changedObjects) - added, len(removed), unchanged, level = WARN_LEVEL)
+		return len(currentDigests)
+	
+	"""
+	yields the entry-elements of the xml-file one by one, while parsing it,
+	every element is cleared after it has been processed
+	"""
+	def _iterEntryElements(self, xmlFile):
+		depth = 0
+		root = None
+		for event, element in cet_iterparse(xmlFile, events = ("start", "end")):
+			if event == "start":
+				depth += 1
+				if root == None:
+					root = element
+				continue
+			depth -= 1
+			if depth == 1:
+				if element.tag == self.xmlNode:
+					yield element
+				# drop the finished element from the tree
+				element.clear()
+				root.clear()
+	
+	"""
+	returns a digest of the serialized xml-entry, without its trailing whitespace
+	"""
+	def _getEntryDigest(self, element):
+		tail = element.tail
+		element.tail = None
+		digest = md5(cet_tostring(element)).digest()
+		element.tail = tail
+		return digest
+	
 	"""
 	loads the objects to ram and returns the count
 	"""	
 	def writeConfigToRam(self, objectList, overwriteExisting = False):
 		counter = 0
-		for object in objectList:
-			if object != None:
-				if self.add(object, overwriteExisting):
-					counter += 1
-		self.log.printOut("%d Entries loaded!" % (counter), level = WARN_LEVEL)
+		bulkLoad = hasattr(objectList, "__len__") and len(objectList) >= BULK_LOAD_MIN_OBJECTS
+		if bulkLoad:
+			self._beginBulkLoad()
+		try:
+			for object in objectList:
+				if object != None:
+					if self.add(object, overwriteExisting):
+						counter += 1
+		finally:
+			if bulkLoad:
+				self._endBulkLoad()
+		self.log.printOut("%d Entries loaded!", counter, level = WARN_LEVEL)
 		return counter
 	
 	"""
@@ -172,7 +817,10 @@ class XMLConfigSupport:
 		returns False if an error occured or the writing isn't allowed at the moment, True if ok
 	"""
 	def writeXml(self, xmlFile = None, objectList = None, ignoreObjectOperationForbidden = False):
+		startTime = time()
+		locked = False
 		try:
+			self.metrics.add("writeXml.calls")
 			isStandardFile = False
 			if xmlFile == None:
 				xmlFile = self.XML_CONFIG
@@ -180,26 +828,571 @@ class XMLConfigSupport:
 			if (isStandardFile and self.objectOperationForbidden) or ignoreObjectOperationForbidden:
 				self.log.printOut("Flag objectOperationForbidden is set, writing of Config-file canceled.", level = WARN_LEVEL)
 				return False
+			isRamState = objectList == None
 			if objectList == None:
-				objectList = self.objects.values()
-			xml = self.getXml(objectList)
-			if xml.__sizeof__() > 0:
-				with open(xmlFile, 'w') as config:
-					config.writelines(xml)
-				if isStandardFile:
+				if isStandardFile and self.currentBatch != None:
+					# written once at the commit of the batch
+					self.currentBatch.writeRequested = True
+					return True
+				if isStandardFile and self.shardCount > 0:
+					self.writeShards()
+					self.writeXMLNeeded = False
+					return True
+				if isStandardFile and self.backgroundWriter != None and self.journalFile == None \
+						and self.configLock == None:
+					self.backgroundWriter.requestWrite(list(self.objects.values()))
 					self.writeXMLNeeded = False
-				self.log.printOut("Config-File \"%s\" written." % (str(xmlFile)), level = DEBUG_LEVEL)
+					return True
+				objectList = self.objects.values()
+			generation = None
+			if isStandardFile and self.configLock != None:
+				self.configLock.acquire(exclusive = True)
+				locked = True
+				diskGeneration = self._readGeneration(xmlFile) if os.path.exists(xmlFile) else 0
+				# the journal contains changes of the others too, it is removed after the write
+				if isRamState and (diskGeneration != self.loadedGeneration or self._getJournalSize() != self.loadedJournalSize):
+					if self.conflictMode != CONFLICT_MERGE:
+						self.log.printOut("Config-File \"%s\" was changed by someone else (generation %d, loaded %d, journal %d bytes, loaded %d), writing canceled.", \
+							xmlFile, diskGeneration, self.loadedGeneration, self._getJournalSize, self.loadedJournalSize, level = ERROR_LEVEL)
+						return False
+					objectList = self._mergeConfigFile(xmlFile)
+				generation = diskGeneration + 1
+			if self._writeXmlFile(xmlFile, objectList, generation) and isStandardFile:
+				self.writeXMLNeeded = False
+				self._updateSnapshotCache(objectList)
+				# the changes of the journal are contained in the xml-file now
+				self._removeJournal()
+				if isRamState:
+					# ram is the content of the file, it's not read again
+					self.lastConfigMtime = self.writtenConfigMtime = self._getConfigMtime()
+					if generation != None:
+						self.loadedGeneration = generation
+						self.loadedJournalSize = 0
+						self.unsavedKeys.clear()
 			return True
+		except XMLConfigLockTimeout, e:
+			self.log.printOut("%s, writing canceled.", e, level = ERROR_LEVEL)
+			return False
 		except:
-			self.log.printOut("writeXml-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("writeXml-Error:\n%s", format_exc, level = ERROR_LEVEL)
 			return False
+		finally:
+			if locked:
+				self.configLock.release()
+			self.metrics.observe("writeXml", time() - startTime)
+			self._dumpMetricsIfDue()
+
+	"""
+	merges the changes in ram into the objects of the xml-file and its journal, which were changed by someone else
+		the objects of the file are taken into ram, except the ones changed in ram since the last read
+		returns the merged objects
+	"""
+	def _mergeConfigFile(self, xmlFile):
+		diskObjectList = []
+		if self.readXml(diskObjectList, xmlFile, clearExisting = False, writeToRam = False) < 0:
+			raise IOError("Config-File \"%s\" couldn't be read for merging" % (str(xmlFile)))
+		diskObjects = {}
+		for object in diskObjectList:
+			diskObjects.setdefault(object.key, object)
+		self.replayJournal(diskObjects)
+		self.loadingConfig = True
+		try:
+			for object in diskObjects.itervalues():
+				if not object.key in self.unsavedKeys:
+					overwrite = object.key in self.objects
+					self._insert(object)
+					self._callHook(self.objectLoaded, object, overwrite)
+			for key in self.objects.keys():
+				if not key in diskObjects and not key in self.unsavedKeys:
+					self._removeKey(key)
+		finally:
+			self.loadingConfig = False
+		self.log.printOut("%d changes in ram merged into %d objects of the config-file!", \
+			len(self.unsavedKeys), len(diskObjects), level = WARN_LEVEL)
+		return self.objects.values()
+
+	"""
+	writes the xml-document with the given objects into the sink (a file or any object providing write)
+		returns the serializer
+	"""
+	def serializeXml(self, sink, objectList):
+		return self._serializeXml(sink, objectList, self.xmlRootAttributes)
+
+	def _serializeXml(self, sink, objectList, rootAttributes):
+		serializer = XMLConfigSerializer(sink, self.xmlRootNode, rootAttributes, \
+			(self.xmlBool["TRUE"], self.xmlBool["FALSE"]))
+		serializer.startDocument()
+		for object in objectList:
+			self.serializeEntry(serializer, object)
+		serializer.endDocument()
+		return serializer
+
+	"""
+	serializes the objects and writes them to the xml-file
+		[generation]:	stored in the root-node, see adjustLocking
+		returns False if there was nothing to write
+	"""
+	def _writeXmlFile(self, xmlFile, objectList, generation = None):
+		if self.xmlRootNode != None:
+			rootAttributes = self.xmlRootAttributes
+			if generation != None:
+				rootAttributes = [attribute for attribute in rootAttributes or [] if attribute[0] != "generation"] \
+					+ [("generation", str(generation))]
+			timings = self._writeFileAtomic(xmlFile, lambda config: self._serializeXml(config, objectList, rootAttributes))
+			self._addWriteMetrics(xmlFile, timings)
+			self.log.printOut("Config-File \"%s\" written (serialize and write %.3fs, sync %.3fs, rename %.3fs).", \
+				xmlFile, *timings, level = DEBUG_LEVEL)
+			return True
+		
+		startTime = time()
+		xml = self.getXml(objectList)
+		if xml:
+			if generation != None:
+				xml = self._setXmlGeneration(xml, generation)
+			serializeTime = time() - startTime
+			self.metrics.observe("serialize", serializeTime)
+			timings = self._writeFileAtomic(xmlFile, lambda config: config.writelines(xml))
+			self._addWriteMetrics(xmlFile, timings)
+			self.log.printOut("Config-File \"%s\" written (serialize %.3fs, write %.3fs, sync %.3fs, rename %.3fs).", \
+				xmlFile, serializeTime, *timings, level = DEBUG_LEVEL)
+			return True
+		return False
+
+	"""
+	the streaming serializer writes while serializing, so its time is part of "write"
+	"""
+	def _addWriteMetrics(self, xmlFile, timings):
+		self.metrics.add("files.written")
+		self.metrics.add("bytes.written", os.path.getsize(xmlFile))
+		self.metrics.observe("write", sum(timings))
+		self.metrics.observe("sync", timings[1])
+
+	"""
+	called by the background-writer to write a snapshot to the standard-file
+	"""
+	def _writeSnapshot(self, objectList):
+		if self._writeXmlFile(self.XML_CONFIG, objectList):
+			# the file contains the state of ram, no need to parse it again
+			self.lastConfigMtime = self.writtenConfigMtime = self._getConfigMtime()
+			self._updateSnapshotCache(objectList)
+
+	"""
+	writes the file via a temporary file in the same directory, which replaces the file afterwards,
+	so the file is never left truncated. The content is written by the given function.
+	every write has an own temporary file, so concurrent writers don't share it
+		returns the durations of writing, syncing and renaming
+	"""
+	def _writeFileAtomic(self, xmlFile, writeFunc):
+		tmpFile = None
+		# a symlinked file stays a symlink, its target is replaced
+		xmlFile = os.path.realpath(xmlFile)
+		try:
+			startTime = time()
+			fd, tmpFile = mkstemp(prefix = os.path.basename(xmlFile) + ".", suffix = ".tmp", \
+				dir = os.path.dirname(xmlFile))
+			with os.fdopen(fd, 'w') as config:
+				writeFunc(config)
+				config.flush()
+				writeTime = time() - startTime
+				startTime = time()
+				if self.writeDurability >= DURABILITY_FILE:
+					os.fsync(config.fileno())
+			if os.path.exists(xmlFile):
+				copymode(xmlFile, tmpFile)
+			else:
+				os.chmod(tmpFile, 0666 & ~_umask)
+			syncTime = time() - startTime
+			
+			startTime = time()
+			os.rename(tmpFile, xmlFile)
+			if self.writeDurability >= DURABILITY_DIRECTORY:
+				dirFd = os.open(os.path.dirname(xmlFile), os.O_RDONLY)
+				try:
+					os.fsync(dirFd)
+				finally:
+					os.close(dirFd)
+			renameTime = time() - startTime
+			return (writeTime, syncTime, renameTime)
+		except:
+			if tmpFile != None and os.path.exists(tmpFile):
+				os.remove(tmpFile)
+			raise
+	
+	"""
+	returns a tuple, which identifies the current content of the file:
+		size, mtime in ns, inode and checksum of the content
+	"""
+	def _getFileFingerprint(self, xmlFile):
+		stat = os.stat(xmlFile)
+		checksum = 1
+		with open(xmlFile, 'rb') as config:
+			while True:
+				data = config.read(65536)
+				if not data:
+					break
+				checksum = adler32(data, checksum)
+		return (stat.st_size, getattr(stat, "st_mtime_ns", int(stat.st_mtime * 1000000000)), \
+			stat.st_ino, checksum & 0xffffffff)
+
+	"""
+	returns the key of the cache-file, which has to match the current objectClass and fingerprint
+	"""
+	def _getSnapshotCacheKey(self, fingerprint):
+		return (PLUGIN_VERSION, self.objectClass.__module__, self.objectClass.__name__, self.xmlNode, fingerprint)
+
+	"""
+	loads the objects from the cache-file, if it matches the fingerprint of the xml-file
+		returns <0 if the cache is missing or outdated, or the count of loaded objects
+	"""
+	def _loadSnapshotCache(self, fingerprint):
+		objectList = None
+		try:
+			if os.path.exists(self.snapshotCacheFile):
+				with open(self.snapshotCacheFile, 'rb') as cache:
+					if cPickle.load(cache) == self._getSnapshotCacheKey(fingerprint):
+						objectList = cPickle.load(cache)
+		except:
+			self.log.printOut("Snapshot-cache \"%s\" couldn't be loaded:\n%s", \
+				self.snapshotCacheFile, format_exc, level = WARN_LEVEL)
+		if objectList == None:
+			self.snapshotCacheMisses += 1
+			self.log.printOut("Snapshot-cache miss (%d hits, %d misses).", \
+				self.snapshotCacheHits, self.snapshotCacheMisses, level = DEBUG_LEVEL)
+			return -1
+		
+		self.snapshotCacheHits += 1
+		self.clear()
+		counter = self.writeConfigToRam(objectList)
+		self.log.printOut("Snapshot-cache hit (%d hits, %d misses).", \
+			self.snapshotCacheHits, self.snapshotCacheMisses, level = DEBUG_LEVEL)
+		return counter
+
+	"""
+	writes the objects to the cache-file, together with the fingerprint of the xml-file
+	"""
+	def _saveSnapshotCache(self, fingerprint, objectList):
+		try:
+			key = self._getSnapshotCacheKey(fingerprint)
+			def writeCache(cache):
+				cPickle.dump(key, cache, cPickle.HIGHEST_PROTOCOL)
+				cPickle.dump(list(objectList), cache, cPickle.HIGHEST_PROTOCOL)
+			self._writeFileAtomic(self.snapshotCacheFile, writeCache)
+		except:
+			self.log.printOut("Snapshot-cache \"%s\" couldn't be written:\n%s", \
+				self.snapshotCacheFile, format_exc, level = WARN_LEVEL)
+			if os.path.exists(self.snapshotCacheFile):
+				os.remove(self.snapshotCacheFile)
+
+	"""
+	rebuilds the cache-file after the standard-file was written
+	"""
+	def _updateSnapshotCache(self, objectList):
+		if self.snapshotCacheFile != None:
+			self._saveSnapshotCache(self._getFileFingerprint(self.XML_CONFIG), objectList)
+
+	"""
+	returns the count of loads from the cache-file, and the count of parsed loads
+	"""
+	def getSnapshotCacheStats(self):
+		return {"hits": self.snapshotCacheHits, "misses": self.snapshotCacheMisses}
+
+	# shards
+	"""
+	returns the path of the shard-file, e.g. "config.3.xml" for "config.xml"
+	"""
+	def getShardFile(self, shard):
+		base, ext = os.path.splitext(self.XML_CONFIG)
+		return "%s.%d%s" % (base, shard, ext)
+
+	"""
+	reads the shard-files, which were changed since the last read
+		returns <0 if an error occurred, 0 if no shard-file was changed, or the count of objects in ram
+	"""
+	def readShards(self):
+		shardFiles = [self.getShardFile(shard) for shard in range(self.shardCount)]
+		if not [shardFile for shardFile in shardFiles if os.path.exists(shardFile)]:
+			if not os.path.exists(self.XML_CONFIG) or os.path.getsize(self.XML_CONFIG) == 0:
+				self.log.printOut("No configuration file present or file is empty!", level = WARN_LEVEL)
+				return -1
+			self.log.printOut("No shard-files present, read from configuration file: %s", \
+				self.XML_CONFIG, level = WARN_LEVEL)
+			# all shards are marked as dirty, and written by the next writeXml
+			self.clear()
+			objectList = []
+			self.parseConfig(cet_parse(self.XML_CONFIG).getroot(), objectList)
+			return self.writeConfigToRam(objectList)
+		
+		readShards = 0
+		self._beginBulkLoad()
+		try:
+			for shard, shardFile in enumerate(shardFiles):
+				fingerprint = None
+				if os.path.exists(shardFile):
+					stat = os.stat(shardFile)
+					fingerprint = (stat.st_size, stat.st_mtime, stat.st_ino)
+				if shard in self.shardFingerprints and fingerprint == self.shardFingerprints[shard]:
+					continue
+				
+				for key in list(self.shardKeys[shard]):
+					self._removeKey(key)
+				foreignKeys = False
+				if fingerprint != None:
+					objectList = []
+					self.parseConfig(cet_parse(shardFile).getroot(), objectList)
+					self.writeConfigToRam(objectList)
+					foreignKeys = len([object for object in objectList if self._getShard(object.key) != shard]) > 0
+				# the shard-file has to be rewritten if it contains objects of other shards
+				if not foreignKeys:
+					self.dirtyShards.discard(shard)
+				self.shardFingerprints[shard] = fingerprint
+				readShards += 1
+		finally:
+			self._endBulkLoad()
+		
+		if readShards == 0:
+			self.log.printOut("No changes in configuration, won't parse!", level = WARN_LEVEL)
+			return 0
+		self.log.printOut("%d of %d shard-files read, %d Entries in ram!", \
+			readShards, self.shardCount, len(self.objects), level = DEBUG_LEVEL)
+		return len(self.objects)
+
+	"""
+	writes the shard-files which contain changed objects
+	"""
+	def writeShards(self):
+		for shard in sorted(self.dirtyShards):
+			shardFile = self.getShardFile(shard)
+			objectList = [self.objects[key] for key in self.shardKeys[shard]]
+			if self._writeXmlFile(shardFile, objectList):
+				stat = os.stat(shardFile)
+				self.shardFingerprints[shard] = (stat.st_size, stat.st_mtime, stat.st_ino)
+				self.dirtyShards.discard(shard)
+
+	def _getShard(self, objectKey):
+		return (crc32(str(objectKey)) & 0xffffffff) % self.shardCount
+
+	# journal
+	"""
+	applies the changes of the journal-file to the objects in ram
+		a record which was written incompletely, e.g. by a power cut, ends the journal
+		[objects]:	dict key -> object, the changes are applied to it instead of ram
+		returns the count of applied records
+	"""
+	def replayJournal(self, objects = None):
+		if self.journalFile == None or not os.path.exists(self.journalFile):
+			return 0
+		counter = 0
+		with open(self.journalFile, 'rb') as journal:
+			while True:
+				offset = journal.tell()
+				record = self._readJournalRecord(journal)
+				if record == None:
+					if offset < os.fstat(journal.fileno()).st_size:
+						self.log.printOut("Journal \"%s\" contains an incomplete record, truncated.", \
+							self.journalFile, level = WARN_LEVEL)
+						journal.close()
+						with open(self.journalFile, 'r+b') as truncJournal:
+							truncJournal.truncate(offset)
+					break
+				operation, payload = record
+				try:
+					if operation == "add":
+						for element in cet_fromstring(payload).findall(self.xmlNode):
+							xobject = self.parseEntry(element)
+							if xobject == None:
+								continue
+							if objects != None:
+								objects[xobject.key] = xobject
+							else:
+								self.add(xobject, True)
+					elif operation == "remove" and objects != None:
+						objects.pop(payload, None)
+					elif operation == "remove" and payload in self.objects:
+						self._removeKey(payload)
+					counter += 1
+				except:
+					self.log.printOut("Journal-record at %d skipped:\n%s", offset, format_exc, level = ERROR_LEVEL)
+		self.log.printOut("%d Journal-records replayed!", counter, level = DEBUG_LEVEL)
+		return counter
+
+	"""
+	writes the objects from ram to the xml-file and removes the journal
+		returns False if an error occured or the writing isn't allowed at the moment, True if ok
+	"""
+	def compactJournal(self):
+		self.log.printOut("Compact journal \"%s\".", self.journalFile, level = DEBUG_LEVEL)
+		return self.writeXml()
+
+	"""
+	appends the record of the operation ("add" with an object, "remove" with a key) to the journal
+	"""
+	def _appendJournal(self, operation, value):
+		if not os.path.exists(self.XML_CONFIG):
+			# the journal is only replayed on top of an existing xml-file
+			self.writeXml()
+			return
+		if operation == "add":
+			payload = "".join(self.getXml([value]))
+		else:
+			payload = str(value)
+		conflict = False
+		if self.configLock != None:
+			self.configLock.acquire(exclusive = True)
+		try:
+			if self.configLock != None and (self._readGeneration(self.XML_CONFIG) != self.loadedGeneration \
+					or self._getJournalSize() != self.loadedJournalSize):
+				# changed by someone else since the last read, writeXml merges or fails, see adjustLocking
+				conflict = True
+			else:
+				with open(self.journalFile, 'ab') as journal:
+					journal.write("%s %.3f %d\n%s\n" % (operation, time(), len(payload), payload))
+					journal.flush()
+					if self.writeDurability >= DURABILITY_FILE:
+						os.fsync(journal.fileno())
+				if self.configLock != None:
+					self.loadedJournalSize = self._getJournalSize()
+					self.unsavedKeys.discard(value.key if operation == "add" else value)
+		finally:
+			if self.configLock != None:
+				self.configLock.release()
+		if conflict:
+			self.writeXml()
+			return
+		# the journal contains the state of ram, no need to parse it again
+		self.lastConfigMtime = self.writtenConfigMtime = self._getConfigMtime()
+		
+		journalSize = os.path.getsize(self.journalFile)
+		if journalSize > self.journalMaxSize or time() - self._getJournalStartTime() > self.journalMaxAge:
+			self.compactJournal()
+
+	"""
+	returns the record as (operation, payload), or None at the end of the journal
+	"""
+	def _readJournalRecord(self, journal):
+		header = journal.readline()
+		parts = header.split()
+		if not header.endswith("\n") or len(parts) != 3:
+			return None
+		length = int(parts[2])
+		payload = journal.read(length + 1)
+		if len(payload) != length + 1:
+			return None
+		return (parts[0], payload[:-1])
+
+	"""
+	returns the time of the first record of the journal
+	"""
+	def _getJournalStartTime(self):
+		with open(self.journalFile, 'rb') as journal:
+			parts = journal.readline().split()
+		if len(parts) == 3:
+			return float(parts[1])
+		return time()
+
+	def _getJournalSize(self):
+		if self.journalFile != None and os.path.exists(self.journalFile):
+			return os.path.getsize(self.journalFile)
+		return 0
+
+	def _removeJournal(self):
+		if self.journalFile != None and os.path.exists(self.journalFile):
+			os.remove(self.journalFile)
+
+	"""
+	returns the generation from the root-node of the xml-file, 0 if there is none
+		only the beginning of the file is read
+	"""
+	def _readGeneration(self, xmlFile):
+		with open(xmlFile, 'rb') as config:
+			head = config.read(4096)
+		match = _rootTagRegex.search(head)
+		if match != None:
+			generationMatch = _generationRegex.search(match.group(2))
+			if generationMatch != None:
+				return int(generationMatch.group(1))
+		return 0
+
+	"""
+	returns the xml (list of strings) of getXml with the generation in the root-node
+	"""
+	def _setXmlGeneration(self, xml, generation):
+		content = "".join(xml)
+		match = _rootTagRegex.search(content)
+		if match == None:
+			return xml
+		attributes = _generationRegex.sub("", match.group(2))
+		if attributes.endswith("/"):
+			attributes = attributes[:-1].rstrip() + " generation=\"%d\" /" % (generation)
+		else:
+			attributes += " generation=\"%d\"" % (generation)
+		return [content[:match.start()], "<%s%s>" % (match.group(1), attributes), content[match.end():]]
+
+	"""
+	called by the watcher with the changed files
+	"""
+	def _onConfigFileChanged(self, files):
+		try:
+			mtime = self._getConfigMtime() if os.path.exists(self.XML_CONFIG) else None
+			if mtime != None and mtime in (self.lastConfigMtime, self.writtenConfigMtime):
+				# own change, ram is already up to date
+				return
+			self.log.printOut("Configuration changed by someone else: %s", lambda: ", ".join(sorted(files)), level = DEBUG_LEVEL)
+			self.configFileChanged = True
+			if self.watcherAutoReload:
+				self.readXml()
+			for callback in self.onConfigChanged:
+				callback()
+		except:
+			self.log.printOut("onConfigFileChanged-Error:\n%s", format_exc, level = ERROR_LEVEL)
+
+	"""
+	returns the mtime of the standard-file, combined with the mtime of the journal if it exists
+	"""
+	def _getConfigMtime(self):
+		mtime = os.path.getmtime(self.XML_CONFIG)
+		if self.journalFile != None and os.path.exists(self.journalFile):
+			return (mtime, os.path.getmtime(self.journalFile))
+		return mtime
 
 	# Help-Functions
+	"""
+	returns a digest of the content of the object, to compare objects with the same key
+		default: digest of the serialized object, you may overwrite it with a faster variant
+	"""
+	def getObjectDigest(self, object):
+		return md5("".join(self.getXml([object]))).digest()
+	
+	"""
+	compares the given objects (e.g. of an import) with the objects in ram, by key and digest
+		returns a dict with the lists of the given objects "added", "changed" and "identical",
+		and the list "removed" with the keys, which are only in ram
+		if a key is given more than once, only the first object is used, like in writeConfigToRam
+	"""
+	def diffObjects(self, objectList):
+		diff = {"added": [], "changed": [], "identical": [], "removed": []}
+		seenKeys = set()
+		for object in objectList:
+			if object == None or object.key in seenKeys:
+				continue
+			seenKeys.add(object.key)
+			registeredObject = self.objects.get(object.key)
+			if registeredObject == None:
+				diff["added"].append(object)
+			elif registeredObject is object or self.getObjectDigest(registeredObject) == self.getObjectDigest(object):
+				diff["identical"].append(object)
+			else:
+				diff["changed"].append(object)
+		diff["removed"] = [key for key in self.objects if not key in seenKeys]
+		self.log.printOut("Diff: %d added, %d changed, %d identical, %d removed.", len(diff["added"]), \
+			len(diff["changed"]), len(diff["identical"]), len(diff["removed"]), level = DEBUG_LEVEL)
+		return diff
+	
 	"""
 	To force a read from the XML-File
 	"""
 	def invalidateXML(self):
 		self.lastConfigMtime = -1
+		self.shardFingerprints.clear()
 	
 	"""
 	To get a python-bool-value from a XML-bool
@@ -212,10 +1405,17 @@ class XMLConfigSupport:
 		elif xmlEnabled == self.xmlBool["TRUE"]:
 			enabled = True
 		else:
-			self.log.printOut("Erroneous config contains invalid value for \"%s\":%s, default: %s" % (xmlAttr, xmlEnabled, default), level = ERROR_LEVEL)
+			self.log.printOut("Erroneous config contains invalid value for \"%s\":%s, default: %s", xmlAttr, xmlEnabled, default, level = ERROR_LEVEL)
 			enabled = False
 		return enabled
 	
+	"""
+	is called by the schema for invalid values, returns the default
+	"""
+	def _invalidValue(self, xmlAttr, value, default):
+		self.log.printOut("Erroneous config contains invalid value for \"%s\":%s, default: %s", xmlAttr, value, default, level = ERROR_LEVEL)
+		return default
+
 	"""
 	To get the XML-Value for a python-bool-value
 		use the method adjustBoolString to configure your values
@@ -231,6 +1431,8 @@ class XMLConfigSupport:
 	"""
 	def setWriteXMLNeeded(self, needed):
 		self.writeXMLNeeded = needed
+		if needed and self.backgroundWriter != None:
+			self.writeXmlIfNeeded()
 	
 	"""
 	To lock the saving or loading of objects, e.g. while editing from the overview
@@ -246,46 +1448,350 @@ class XMLConfigSupport:
 		if self.writeXMLNeeded:
 			self.writeXml(ignoreObjectOperationForbidden = ignoreObjectOperationForbidden)
 	
+	"""
+	To wait until the queued write of the background-writer is done, e.g. on shutdown
+		returns False if the timeout (in seconds) was reached before
+	"""
+	def flushXml(self, timeout = None):
+		if self.backgroundWriter != None:
+			return self.backgroundWriter.flush(timeout)
+		return True
+	
+	# asynchronous functions, which return a Deferred firing on the main loop (twisted)
+	"""
+	parses the xml-file within a thread, only the taking of the objects into ram runs on the main loop
+		the Deferred fires with the result of readXml
+		[cancelFunc]:	called on the main loop before the objects are taken into ram,
+						if it returns True, they are dropped (e.g. if ram was changed in between)
+		the standard-file is read by readXml on the main loop, if one of the load-modes is used, which
+		keeps its own state (shards, lazy load, snapshot-cache, journal, incremental reload, locking)
+	"""
+	def readXmlAsync(self, xmlFile = None, clearExisting = True, overwriteExisting = False, cancelFunc = None):
+		from XMLConfigAsync import deferToPool
+		from twisted.internet.defer import succeed
+		isStandardFile = xmlFile == None
+		if isStandardFile:
+			if self._usesLoadMode():
+				return succeed(self.readXml(clearExisting = clearExisting, overwriteExisting = overwriteExisting))
+			xmlFile = self.XML_CONFIG
+			if os.path.exists(xmlFile) and self._getConfigMtime() == self.lastConfigMtime:
+				self.log.printOut("No changes in configuration, won't parse!", level = WARN_LEVEL)
+				return succeed(0)
+		deferred = deferToPool(self._parseXmlFile, xmlFile, isStandardFile)
+		deferred.addCallback(self._commitXmlObjects, isStandardFile, clearExisting, overwriteExisting, cancelFunc)
+		return deferred
+	"""
+	returns True if the standard-file is loaded by a mode, which the plain parse of readXmlAsync would bypass
+	"""
+	def _usesLoadMode(self):
+		return self.shardCount > 0 or self.lazyKeyAttribute != None or self.snapshotCacheFile != None \
+			or self.journalFile != None or self.incrementalReload or self.configLock != None
+	"""
+	parses the xml-file (e.g. for an import) within a thread, without changing ram
+		the Deferred fires with the list of the objects, or None if an error occurred
+	"""
+	def parseXmlAsync(self, xmlFile):
+		from XMLConfigAsync import deferToPool
+		deferred = deferToPool(self._parseXmlFile, xmlFile, False)
+		deferred.addCallback(lambda result: result[1])
+		return deferred
+	"""
+	serializes and writes the objects within a thread, e.g. for an export
+		[objectList]:	default: a snapshot of the objects in ram
+		the Deferred fires with the result of writeXml
+		use the thread-safe mode (adjustThreadSafe) for the standard-file, if it may be written at the same time
+	"""
+	def writeXmlAsync(self, xmlFile = None, objectList = None, ignoreObjectOperationForbidden = False):
+		from XMLConfigAsync import deferToPool
+		if objectList == None:
+			objectList = self.getObjectList()
+		else:
+			objectList = list(objectList)
+		return deferToPool(self.writeXml, xmlFile, objectList, ignoreObjectOperationForbidden)
+
+	"""
+	runs within the thread, returns (mtime, list of objects), the objects are None if an error occurred
+	"""
+	def _parseXmlFile(self, xmlFile, isStandardFile):
+		try:
+			self.log.printOut("Read from configuration file: %s", xmlFile, level = DEBUG_LEVEL)
+			if not os.path.exists(xmlFile) or os.path.getsize(xmlFile) == 0:
+				self.log.printOut("No configuration file present or file is empty!", level = WARN_LEVEL)
+				return (None, None)
+			mtime = self._getConfigMtime() if isStandardFile else None
+			objects = []
+			self.parseConfig(cet_parse(xmlFile).getroot(), objects)
+			return (mtime, objects)
+		except:
+			self.log.printOut("parseXmlFile-Error:\n%s", format_exc, level = ERROR_LEVEL)
+			return (None, None)
+
+	"""
+	runs on the main loop, takes the parsed objects into ram
+	"""
+	def _commitXmlObjects(self, result, isStandardFile, clearExisting, overwriteExisting, cancelFunc):
+		mtime, objects = result
+		if objects == None:
+			return -1
+		if cancelFunc != None and cancelFunc():
+			self.log.printOut("Parsed configuration dropped.", level = DEBUG_LEVEL)
+			return 0
+		if clearExisting:
+			self.clear()
+		counter = self.writeConfigToRam(objects, overwriteExisting)
+		if isStandardFile:
+			self.lastConfigMtime = mtime
+			self.loadCount += 1
+			# the change is loaded, the watcher mustn't trigger another parse
+			self.configFileChanged = False
+		return counter
+
+	# metrics
+	"""
+	returns the metrics of the instance, see adjustMetrics:
+		counters:		readXml.calls, readXml.skipped (unchanged file), entries.parsed, writeXml.calls,
+						files.written and bytes.written
+		histograms:		durations in milliseconds of readXml, writeXml, serialize (getXml), write (write, sync
+						and rename of a file), sync, and with detailed metrics parseEntry and hook.<name of the hook>
+		objects:		count of the objects in ram
+	"""
+	def getStats(self):
+		stats = self.metrics.getStats()
+		stats["objects"] = len(self.objects)
+		return stats
+
+	def resetStats(self):
+		self.metrics.reset()
+
+	def _dumpMetricsIfDue(self):
+		if self.metricsDumpInterval <= 0 or time() < self.nextMetricsDump:
+			return
+		self.nextMetricsDump = time() + self.metricsDumpInterval
+		try:
+			name = os.path.basename(self.XML_CONFIG)
+			if self.metricsDumpFile != None:
+				self.metrics.dumpToFile(self.metricsDumpFile, name)
+			else:
+				self.log.printOut("Metrics:\n%s", lambda: "\n".join(self.metrics.formatStats(name)), level = WARN_LEVEL)
+		except:
+			self.log.printOut("dumpMetrics-Error:\n%s", format_exc, level = ERROR_LEVEL)
+
+	"""
+	returns the function to parse an entry, it measures every call with detailed metrics
+	"""
+	def _getParseFunc(self):
+		if not self.detailedMetrics:
+			return self.parseEntry
+		parseEntry = self.parseEntry
+		observe = self.metrics.observe
+		def timedParseEntry(element):
+			startTime = time()
+			object = parseEntry(element)
+			observe("parseEntry", time() - startTime)
+			return object
+		return timedParseEntry
+
 	# functions to manage the objectList in RAM
 	def clear(self):
+		if self.currentBatch != None:
+			for key in self.objects:
+				self.currentBatch.touch(key)
+		self.changeCount += 1
 		self.objects.clear()
+		self.entryDigests.clear()
+		for index in self.indexes.itervalues():
+			index.clear()
+		for view in self.sortedViews.itervalues():
+			view.clear()
+		for keys in self.shardKeys:
+			keys.clear()
+		self.dirtyShards = set(range(self.shardCount))
 	
 	def exists(self, objectKey):
 		return objectKey in self.objects
 
+	"""
+	returns the objects as list, which isn't changed by later changes of ram
+	"""
+	def getObjectList(self):
+		return list(self.objects.values())
+
 	def get(self, objectKey):
-		if objectKey in self.objects:
-			return self.objects[objectKey]
-		return None
+		return self.objects.get(objectKey)
 		
 	def add(self, object, overwrite = False):
 		try:
 			if not object.key in self.objects or overwrite:
-				self.objects[object.key] = object
-				self.objectLoaded(object, overwrite)
+				self._insert(object)
+				self._callHook(self.objectLoaded, object, overwrite)
 				return True
 			return False
 		except:
-			self.log.printOut("add-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("add-Error:\n%s", format_exc, level = ERROR_LEVEL)
+	
+	def _insert(self, object):
+		if self.currentBatch != None:
+			self.currentBatch.touch(object.key)
+		if self.configLock != None and not self.loadingConfig:
+			self.unsavedKeys.add(object.key)
+		self.changeCount += 1
+		self.objects[object.key] = object
+		self.entryDigests.pop(object.key, None)
+		if self.bulkLoadDepth > 0:
+			self.indexesOutdated = True
+		else:
+			for index in self.indexes.itervalues():
+				index.remove(object.key)
+				index.insert(object)
+			for view in self.sortedViews.itervalues():
+				view.remove(object.key)
+				view.insert(object)
+		if self.shardCount > 0:
+			shard = self._getShard(object.key)
+			self.shardKeys[shard].add(object.key)
+			self.dirtyShards.add(shard)
 	
 	def remove(self, object):
 		try:
 			if object.key in self.objects:
-				self.objects.pop(object.key)
+				self._removeKey(object.key)
 		except:
-			self.log.printOut("remove-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("remove-Error:\n%s", format_exc, level = ERROR_LEVEL)
+	
+	def _removeKey(self, objectKey):
+		if self.currentBatch != None:
+			self.currentBatch.touch(objectKey)
+		if self.configLock != None and not self.loadingConfig:
+			self.unsavedKeys.add(objectKey)
+		self.changeCount += 1
+		self.objects.pop(objectKey)
+		self.entryDigests.pop(objectKey, None)
+		if self.bulkLoadDepth > 0:
+			self.indexesOutdated = True
+		else:
+			for index in self.indexes.itervalues():
+				index.remove(objectKey)
+			for view in self.sortedViews.itervalues():
+				view.remove(objectKey)
+		if self.shardCount > 0:
+			shard = self._getShard(objectKey)
+			self.shardKeys[shard].discard(objectKey)
+			self.dirtyShards.add(shard)
+	
+	"""
+	calls the hook, or defers it until the commit of the current batch
+	"""
+	def _callHook(self, hook, *args):
+		if self.currentBatch != None:
+			self.currentBatch.deferHook(hook, args)
+		elif self.detailedMetrics:
+			startTime = time()
+			hook(*args)
+			self.metrics.observe("hook." + hook.__name__, time() - startTime)
+		else:
+			hook(*args)
+	
+	"""
+	To change many objects at once, as transaction within a with-statement:
+		with support.batch():
+			for object in objects:
+				support.addObject(object = object, overwrite = True)
+	the hooks and the writing are deferred until the end, and the changes in ram are
+	undone if an exception escapes, see XMLConfigBatch
+		writeToDisk:	refresh ram at the beginning, and write the xml-file once at the end
+	"""
+	def batch(self, writeToDisk = True):
+		return XMLConfigBatch(self, writeToDisk)
+	
+	# secondary indexes and queries
+	"""
+	To declare a secondary index, which is used by the queries
+		name:			name of the index, e.g. the name of the attribute
+		ordered:		False for a hash-index (only equality), True for range-, prefix-queries and sorting
+		[valueFunc]:	function which returns the indexed value of an object, default: the attribute with the name of the index
+	"""
+	def addIndex(self, name, ordered = False, valueFunc = None):
+		if valueFunc == None:
+			valueFunc = lambda object: getattr(object, name, None)
+		if ordered:
+			index = XMLConfigOrderedIndex(name, valueFunc)
+		else:
+			index = XMLConfigHashIndex(name, valueFunc)
+		index.build(self.objects.itervalues())
+		self.indexes[name] = index
+	
+	"""
+	fills the registered indexes and sorted views with all objects again, e.g. after the objects were replaced
+	"""
+	def _rebuildIndexes(self):
+		self.indexesOutdated = False
+		for index in self.indexes.itervalues():
+			index.build(self.objects.itervalues())
+		for view in self.sortedViews.itervalues():
+			view.build(self.objects.itervalues())
+	
+	"""
+	To load many objects at once, add and remove don't update the indexes and sorted views,
+	they are built once by the last _endBulkLoad, the calls can be nested
+		the hooks, which are called while loading, see the indexes and sorted views of before
+	"""
+	def _beginBulkLoad(self):
+		self.bulkLoadDepth += 1
+	
+	def _endBulkLoad(self):
+		self.bulkLoadDepth -= 1
+		if self.bulkLoadDepth == 0 and self.indexesOutdated:
+			self._rebuildIndexes()
+	
+	def removeIndex(self, name):
+		self.indexes.pop(name, None)
+	
+	"""
+	returns a new query on the objects, see XMLConfigQuery
+	"""
+	def query(self):
+		return XMLConfigQuery(self)
+	
+	"""
+	returns the type, count of objects and count of lookups of every index
+	"""
+	def getIndexStats(self):
+		stats = {}
+		for name, index in self.indexes.iteritems():
+			stats[name] = {"type": index.indexType, "size": len(index), "lookups": index.lookups}
+		return stats
 	
 	"""
 	use this method only if the object has a name-attr
+		viewName:	ordering of the list, see getSortedView
 	"""
-	def getSortedTupleList(self):
-		list = []
+	def getSortedTupleList(self, viewName = "name"):
 		try:
-			for key in sorted(self.objects, key = lambda key: self.objects[key].name.lower()):
-				list.append(self.objects[key])
+			return list(self.getSortedView(viewName).tuples)
 		except:
-			self.log.printOut("getSortedTupleList-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
-		return [(x,) for x in list]
+			self.log.printOut("getSortedTupleList-Error:\n%s", format_exc, level = ERROR_LEVEL)
+		return []
+	
+	"""
+	returns the sorted view of the objects, which is kept up to date while adding or removing objects
+		viewName:	a predefined ordering ("name", "locale", "enabledFirst") or one added with addSortedView
+		the view provides the objects by position, use it read-only
+	"""
+	def getSortedView(self, viewName = "name"):
+		view = self.sortedViews.get(viewName)
+		if view == None:
+			view = self.addSortedView(viewName, SORTED_VIEW_KEYS[viewName])
+		return view
+	
+	"""
+	To add an own ordering of the objects
+		keyFunc:	function which returns the sort-key of an object
+	"""
+	def addSortedView(self, viewName, keyFunc):
+		view = XMLConfigSortedView(viewName, keyFunc)
+		view.build(self.objects.itervalues())
+		self.sortedViews[viewName] = view
+		return view
 
 	"""
 	General method to add or modify an Entry
@@ -304,9 +1810,7 @@ class XMLConfigSupport:
 			overwrite = False, writeToDisk = True):
 		try:
 			if writeToDisk:
-				# save "unsafed" values and refresh ram
-				self.writeXmlIfNeeded(ignoreObjectOperationForbidden = True)
-				self.readXml()
+				self._refreshBeforeWrite()
 			
 			oldKey = ""
 			isUpdating = False
@@ -316,14 +1820,49 @@ class XMLConfigSupport:
 			
 			if session:
 				session.openWithCallback(
-					boundFunction(self._editorCallback, callbackfunc, overwrite, writeToDisk, oldKey),
+					partial(self._editorCallback, callbackfunc, overwrite, writeToDisk, oldKey),
 					self.objectEditor,
 					object,
 					isUpdating)
 			else:
 				self._editorCallback(callbackfunc, overwrite, writeToDisk, oldKey, object)
 		except:
-			self.log.printOut("addObject-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("addObject-Error:\n%s", format_exc, level = ERROR_LEVEL)
+
+	"""
+	General method to remove an Entry
+		object:			the object to remove
+		writeToDisk:	if you want to remove the object from the XML-file
+		returns True if the object was removed
+	"""
+	def removeObject(self, object, writeToDisk = True):
+		try:
+			if writeToDisk:
+				self._refreshBeforeWrite()
+			
+			if not self.exists(object.key):
+				return False
+			self.remove(object)
+			if writeToDisk:
+				if self.journalFile != None and self.currentBatch == None:
+					self._appendJournal("remove", object.key)
+				else:
+					self.writeXml()
+			return True
+		except:
+			self.log.printOut("removeObject-Error:\n%s", format_exc, level = ERROR_LEVEL)
+			return False
+
+	"""
+	saves "unsafed" values and refreshes ram, before an object is written
+	"""
+	def _refreshBeforeWrite(self):
+		# a pending background-write already contains the newest state of ram,
+		# within a batch ram was refreshed at its beginning
+		if self.currentBatch != None or (self.backgroundWriter != None and self.backgroundWriter.isPending()):
+			return
+		self.writeXmlIfNeeded(ignoreObjectOperationForbidden = True)
+		self.readXml()
 
 	"""
 	internal callback-method
@@ -331,18 +1870,27 @@ class XMLConfigSupport:
 	def _editorCallback(self, callbackfunc, overwrite, writeToDisk, oldKey, object):
 		try:
 			if object:
-				if overwrite and oldKey != object.key:
+				renamed = overwrite and oldKey != object.key
+				if renamed:
 					oldObject = self.get(oldKey)
 					if oldObject != None:
-						self.objectOverwritten(object, oldObject)
-					self.remove(oldKey)
+						self._callHook(self.objectOverwritten, object, oldObject)
+					# the editor changes the object in place, so it carries the new key already
+					if oldKey in self.objects:
+						self._removeKey(oldKey)
 				added = self.add(object, overwrite)
 				if added:
-					self.objectAdded(object, overwrite, writeToDisk)
+					self._callHook(self.objectAdded, object, overwrite, writeToDisk)
 				
 				if writeToDisk:
-					# if called from overview then the screen is already closed, and doesn't lock the writing
-					self.writeXml()
+					if self.journalFile != None and self.currentBatch == None:
+						if renamed:
+							self._appendJournal("remove", oldKey)
+						if added:
+							self._appendJournal("add", object)
+					else:
+						# if called from overview then the screen is already closed, and doesn't lock the writing
+						self.writeXml()
 				
 				if callbackfunc != None:
 					try:
@@ -350,4 +1898,4 @@ class XMLConfigSupport:
 					except TypeError:
 						callbackfunc(added)
 		except:
-			self.log.printOut("addObject-editorCallback-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
+			self.log.printOut("addObject-editorCallback-Error:\n%s", format_exc, level = ERROR_LEVEL)
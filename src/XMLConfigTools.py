@@ -1,209 +1,134 @@
 # -*- coding: utf-8 -*-
 
 from Plugins.SystemPlugins.GeneralLogger.GeneralLogger import OutLogger, ERROR_LEVEL, WARN_LEVEL, DEBUG_LEVEL
-from traceback import format_exc
 
 PLUGIN_VERSION = "0.1b1"
 
-# -- File-Dialog
-from Screens.Screen import Screen
-
-from Components.ActionMap import ActionMap
-from Components.Pixmap import Pixmap
-from Components.Label import Label
-from Components.Button import Button
-from Components.FileList import FileList
-
-from . import _
-
-generalLogger = None
-def getGeneralLogger(additionalPrefix = ""):
-	global generalLogger
-	if generalLogger == None:
-		prefix = "XMLConfigTool"
-		if additionalPrefix and additionalPrefix != "":
-			prefix += " %s" % additionalPrefix
-		generalLogger = OutLogger(prefix = prefix, inPluginVersion = PLUGIN_VERSION)
-	return generalLogger
-
-class selectFileDlg(Screen):
-	skin = """
-		<screen name="selectFileDlg" position="center,center" size="700,450">
-			<widget name="filelist" position="10,10" size="680,300" scrollbarMode="showOnDemand" />
-			<widget name="key_green_text" position="70,360" size="600,25" halign="left" zPosition="10" font="Regular;21" transparent="1" />
-			<widget name="button_green" pixmap="skin_default/buttons/button_green.png" position="30,360" zPosition="10" size="35,25" transparent="1" alphatest="on" />
-			<widget name="key_red_text" position="70,390" size="270,25" halign="left" zPosition="10" font="Regular;21" transparent="1" />
-			<widget name="button_red" pixmap="skin_default/buttons/button_red.png" position="30,390" zPosition="10" size="35,25" transparent="1" alphatest="on" />
-			<widget name="key_blue_text" position="420,390" size="270,25" halign="left" zPosition="10" font="Regular;21" transparent="1" />
-			<widget name="button_blue" pixmap="skin_default/buttons/button_blue.png" position="380,390" zPosition="10" size="35,25" transparent="1" alphatest="on" />
-		</screen>"""
-
-	def __init__(self, session, startDir = None, showDirectories = True, showFiles = False, \
-			showMountpoints = True, matchingPattern = None, useServiceRef = False, \
-			inhibitDirs = False, inhibitMounts = False, isTop = False, enableWrapAround = False, \
-			additionalExtensions = None, selOnlyFiles = False, permanentBookmark = None, \
-			loggerInstance = None):
-		try:
-			Screen.__init__(self, session)
-			self.session = session
-			self.selOnlyFiles = selOnlyFiles
-			self.showFiles = showFiles
-			if self.selOnlyFiles:
-				self.showFiles = True
-			self.epath = ""
-
-			self.log = loggerInstance
-			if self.log == None:
-				self.log = getGeneralLogger()
-	
-			self["button_green"] = Pixmap()
-			self["key_green_text"] = Button()
-			self["button_red"] = Pixmap()
-			self["key_red_text"] = Label(_("Close"))
-			self["button_blue"] = Pixmap()
-			self["key_blue_text"] = Button()
-			if startDir == None or startDir == "":
-				startDir = "/media/hdd"
-			
-			self["filelist"] = FileList(directory = startDir, showDirectories = showDirectories, \
-				showFiles = self.showFiles, showMountpoints = showMountpoints, \
-				matchingPattern = matchingPattern, useServiceRef = useServiceRef, \
-				inhibitDirs = inhibitDirs, inhibitMounts = inhibitMounts, isTop = isTop, \
-				enableWrapAround = enableWrapAround, additionalExtensions = additionalExtensions)
-			self["actions"] = ActionMap(["WizardActions", "DirectionActions", "ColorActions"],
-			{
-				"ok": self.ok,
-				"back": self.cancel,
-				"left": self.left,
-				"right": self.right,
-				"up": self.up,
-				"down": self.down,
-				"green": self.green,
-				"red": self.red,
-				"blue": self.goToPermanentBookmark,
-			}, -1)
-			
-			if permanentBookmark != None and not isinstance(permanentBookmark, dict):
-				permanentBookmark = None
-			self.permanentBookmark = permanentBookmark
-			self.configureBlueButton()
-	
-			self.onLayoutFinish.append(self.setStartDir)
-		except:
-			if self.log == None:
-				self.log.printOut("selectFileDlg-Init-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
-			else:
-				getGeneralLogger().printOut("selectFileDlg-Init-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
-			self.close(None)
-
-	def configureBlueButton(self):
-		try:
-			if self.permanentBookmark != None and self.permanentBookmark.keys()[0] != self["filelist"].getCurrentDirectory():
-				self["key_blue_text"].setText(self.permanentBookmark.values()[0])
-				self["button_blue"].show()
+# messages with a higher level are dropped before they are formatted, see setLogLevel
+# None passes all messages to the General-Logger, which filters them by its own level
+logLevel = None
+
+"""
+To drop the messages above the level already in the facade, e.g. WARN_LEVEL in normal operation
+	it is set by the plugin, which uses the tool (e.g. from its own setup), or by a benchmark,
+	the level of the General-Logger isn't known to the facade, so None (default) drops nothing
+"""
+def setLogLevel(level):
+	global logLevel
+	logLevel = level
+
+"""
+Facade of a General-Logger, which formats a message only if its level is logged, see setLogLevel
+	log.printOut("%d Entries parsed from %s!", counter, xmlFile, level = DEBUG_LEVEL)
+	the arguments are inserted into the text with %, callables among them (e.g. format_exc,
+	or a lambda for an expensive value) are called only if the message is logged
+	a text without arguments is logged as it is
+	the call of the General-Logger, printOut(text, level) with a formatted text, is accepted too
+	logging never raises, a text which can't be formatted is logged with its arguments appended
+
+outLogger:	Instance of a General-Logger (OutLogger), or another facade
+[prefix]:	prefix of the messages of this facade, e.g. the name of a support-instance
+"""
+class XMLConfigLogger:
+	def __init__(self, outLogger, prefix = ""):
+		if isinstance(outLogger, XMLConfigLogger):
+			if not prefix:
+				prefix = outLogger.prefix
+			outLogger = outLogger.outLogger
+		self.outLogger = outLogger
+		self.prefix = prefix
+		self.textPrefix = "[%s] " % (prefix) if prefix else ""
+
+	def isEnabled(self, level):
+		return logLevel == None or level <= logLevel
+
+	def printOut(self, text, *args, **kwargs):
+		level = kwargs.get("level")
+		if level == None:
+			if len(args) == 1 and args[0] in (ERROR_LEVEL, WARN_LEVEL, DEBUG_LEVEL) and type(args[0]) == int:
+				# printOut(text, level) of the General-Logger
+				level = args[0]
+				args = ()
 			else:
-				self["key_blue_text"].text = ""
-				self["button_blue"].hide()
-		except:
-			self.log.printOut("configureBlueButton-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
-	
-	def goToPermanentBookmark(self):
+				level = DEBUG_LEVEL
+		if logLevel != None and level > logLevel:
+			return
 		try:
-			if self.permanentBookmark != None:
-				self["filelist"].changeDir(self.permanentBookmark.keys()[0])
-				self.updatePathName()
+			if args:
+				try:
+					text = text % tuple([arg() if callable(arg) else arg for arg in args])
+				except:
+					text = "%s %r" % (text, args)
+			self.outLogger.printOut(self.textPrefix + text, level = level)
 		except:
-			self.log.printOut("goToPermanentBookmark-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
-
-	def setWindowTitle(self):
-		if self.instance and self["filelist"].getCurrentDirectory():
-			self.instance.setTitle(self["filelist"].getCurrentDirectory())
-	
-	def setStartDir(self):
-		try:
-			try:
-				if self["filelist"].canDescent():
-					self["filelist"].descent()
-			except:
-				self.log.printOut("setStartDir-inner-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)	
-			self.setWindowTitle()
-			self.setPathName()
-		except:
-			self.log.printOut("setStartDir-Error:\n%s" % (str(format_exc())), level = ERROR_LEVEL)
-
-	def updatePathName(self):
-		# getFilename is None if e.g. device-list is selected
-		if self.showFiles or (self["filelist"].getFilename() and len(self["filelist"].getFilename()) > len(self["filelist"].getCurrentDirectory())):
-			self.setPathName()
-		else:
-			self["key_green_text"].hide()
-			self["button_green"].hide()
-		self.setWindowTitle()
-		self.configureBlueButton()
-
-	def setPathName(self):
-		if self.showFiles and self["filelist"].canDescent() == False:
-			self.fileName = self["filelist"].getFilename()
-			self.epath = self["filelist"].getCurrentDirectory() + "/" + self["filelist"].getFilename()
-		else:
-			self.fileName = ""
-			self.epath = self["filelist"].getCurrentDirectory()
-		if len(self.epath) > 1 and self.epath.endswith('/'):
-			self.epath = self.epath[:-1]
-		if self.selOnlyFiles:
-			if self.fileName == "":
-				self["key_green_text"].setText(_("select a valid file"))
-			else:
-				self["key_green_text"].setText(_("select: %s") % (self.fileName))
-		else:
-			self["key_green_text"].setText(_("select: %s") % (self.epath))
-		self["key_green_text"].show()
-		self["button_green"].show()
-
-	def ok(self):
-		if self["filelist"].canDescent():
-			self["filelist"].descent()
-			if self["filelist"].getFilename() != None and self["filelist"].getCurrentDirectory() != None:
-				if len(self["filelist"].getFilename()) > len(self["filelist"].getCurrentDirectory()):
-					self.setPathName()
-				else:
-					self["key_green_text"].hide()
-					self["button_green"].hide()
-				self.setWindowTitle()
-			self.updatePathName()
-		else:
-			if self.selOnlyFiles and self.fileName != "":
-				self.close(self.epath)
-
-	def up(self):
-		self["filelist"].up()
-		self.updatePathName()
-
-	def down(self):
-		self["filelist"].down()
-		self.updatePathName()
-
-	def left(self):
-		self["filelist"].pageUp()
-		self.updatePathName()
-
-	def right(self):
-		self["filelist"].pageDown()
-		self.updatePathName()
-
-	def cancel(self):
-		self.close(False)
-
-	def red(self):
-		self.close(False)
-
-	def green(self):
-		if not self.selOnlyFiles or self.fileName != "":
-			self.close(self.epath)
+			pass
 
+generalLogger = None
+defaultLogger = None
+
+"""
+returns a facade of the General-Logger of the plugin, see XMLConfigLogger
+	all facades share one OutLogger, additionalPrefix distinguishes their messages
+	[loggerInstance]:	an own General-Logger, which is used instead
+"""
+def getGeneralLogger(additionalPrefix = "", loggerInstance = None):
+	global generalLogger, defaultLogger
+	if loggerInstance != None:
+		if isinstance(loggerInstance, XMLConfigLogger) and not additionalPrefix:
+			return loggerInstance
+		return XMLConfigLogger(loggerInstance, additionalPrefix)
+	if generalLogger == None:
+		generalLogger = OutLogger(prefix = "XMLConfigTool", inPluginVersion = PLUGIN_VERSION)
+		defaultLogger = XMLConfigLogger(generalLogger)
+	if additionalPrefix:
+		return XMLConfigLogger(generalLogger, additionalPrefix)
+	return defaultLogger
+
+"""
+returns the file-dialog, its modules are imported on the first call, so the storage-core doesn't need them
+"""
+def getFileDialogClass():
+	import XMLConfigFileDialog
+	return XMLConfigFileDialog.selectFileDlg
+
+"""
+stands for XMLConfigFileDialog.selectFileDlg, until it is used
+	calls, attributes, isinstance and issubclass are passed to the dialog,
+	a class inheriting from it inherits from the dialog
+"""
+class LazyFileDialogType(type):
+	def __new__(metaclass, name, bases, attributes):
+		if [base for base in bases if isinstance(base, LazyFileDialogType)]:
+			bases = tuple([getFileDialogClass() if isinstance(base, LazyFileDialogType) else base for base in bases])
+			# created by the metaclass of the dialog
+			return type(name, bases, attributes)
+		return type.__new__(metaclass, name, bases, attributes)
+
+	def __call__(cls, *args, **kwargs):
+		return getFileDialogClass()(*args, **kwargs)
+
+	def __getattr__(cls, name):
+		return getattr(getFileDialogClass(), name)
+
+	def __instancecheck__(cls, instance):
+		return isinstance(instance, getFileDialogClass())
+
+	def __subclasscheck__(cls, subclass):
+		return issubclass(subclass, getFileDialogClass())
+
+"""
+the file-dialog under its former name, e.g. session.open(selectFileDlg, ...), see LazyFileDialogType
+"""
+class selectFileDlg(object):
+	__metaclass__ = LazyFileDialogType
+
+"""
+opens the file-dialog, see XMLConfigFileDialog.selectFile
+	the modules of the dialog are imported on the first call, so the storage-core doesn't need them
+"""
 def selectFile(session, callback, startDir = None, showFiles = False, matchingPattern = None, \
 		selOnlyFiles = False, permanentBookmark = None, loggerInstance = None):
-	session.openWithCallback(callback, selectFileDlg, startDir = startDir, showFiles = showFiles, \
-			matchingPattern = matchingPattern, selOnlyFiles = selOnlyFiles, \
-			permanentBookmark = permanentBookmark, loggerInstance = loggerInstance)
-
+	import XMLConfigFileDialog
+	XMLConfigFileDialog.selectFile(session, callback, startDir = startDir, showFiles = showFiles, \
+		matchingPattern = matchingPattern, selOnlyFiles = selOnlyFiles, \
+		permanentBookmark = permanentBookmark, loggerInstance = loggerInstance)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+from traceback import format_exc
+import errno
+import os
+import struct
+
+from XMLConfigTools import ERROR_LEVEL, WARN_LEVEL, DEBUG_LEVEL, getGeneralLogger
+
+# see linux/inotify.h
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+# files are replaced by renaming, so their directories are watched
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+_eventHeader = struct.Struct("iIII")
+
+_libc = None
+
+def _getLibc():
+	global _libc
+	if _libc == None:
+		# ctypes is imported on the first watch, not at the start of enigma
+		from ctypes import CDLL
+		from ctypes.util import find_library
+		_libc = CDLL(find_library("c") or "libc.so.6", use_errno = True)
+	return _libc
+
+"""
+Watches files via inotify, and calls the callback with the set of the changed files
+	the events are read by the main loop of enigma (eSocketNotifier), if it is available,
+	otherwise poll has to be called, e.g. before the files are used
+	if the watch breaks (e.g. the directory is removed, or inotify isn't available), isActive returns False,
+	and the files have to be checked by their mtime again
+
+files:				list of the absolute paths of the watched files
+callback:			function which is called with the set of the paths of the changed files
+[loggerInstance]:	Instance of a General-Logger from System-Plugin
+"""
+class XMLConfigWatcher:
+	def __init__(self, files, callback, loggerInstance = None):
+		self.files = set([os.path.abspath(file) for file in files])
+		self.callback = callback
+		self.fd = -1
+		# watch-descriptor -> directory
+		self.watches = {}
+		self.notifier = None
+		self.eventCount = 0
+
+		self.log = getGeneralLogger(loggerInstance = loggerInstance)
+
+	"""
+	starts the watching, returns False if inotify isn't available
+	"""
+	def start(self):
+		try:
+			from ctypes import get_errno
+			libc = _getLibc()
+			self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+			if self.fd < 0:
+				raise OSError(get_errno(), os.strerror(get_errno()))
+			for directory in set([os.path.dirname(file) for file in self.files]):
+				wd = libc.inotify_add_watch(self.fd, directory, WATCH_MASK)
+				if wd < 0:
+					raise OSError(get_errno(), "%s: %s" % (os.strerror(get_errno()), directory))
+				self.watches[wd] = directory
+			try:
+				from enigma import eSocketNotifier
+				from select import POLLIN
+				self.notifier = eSocketNotifier(self.fd, POLLIN)
+				self.notifier.callback.append(self._onReadable)
+			except ImportError:
+				self.log.printOut("No main loop available, the watcher has to be polled.", level = DEBUG_LEVEL)
+			self.log.printOut("Watching %s.", lambda: ", ".join(sorted(self.files)), level = DEBUG_LEVEL)
+			return True
+		except:
+			self.log.printOut("XMLConfigWatcher-Error:\n%s", format_exc, level = ERROR_LEVEL)
+			self.stop()
+			return False
+
+	def stop(self):
+		if self.notifier != None:
+			self.notifier.callback.remove(self._onReadable)
+			self.notifier = None
+		if self.fd >= 0:
+			os.close(self.fd)
+			self.fd = -1
+		self.watches.clear()
+
+	def isActive(self):
+		return self.fd >= 0 and len(self.watches) > 0
+
+	"""
+	reads the pending events without blocking and calls the callback
+		returns the count of events
+	"""
+	def poll(self):
+		if self.fd < 0:
+			return 0
+		changed = set()
+		count = 0
+		while True:
+			try:
+				data = os.read(self.fd, 65536)
+			except OSError, e:
+				if e.errno in (errno.EAGAIN, errno.EINTR):
+					break
+				raise
+			if not data:
+				break
+			offset = 0
+			while offset + _eventHeader.size <= len(data):
+				wd, mask, cookie, length = _eventHeader.unpack_from(data, offset)
+				name = data[offset + _eventHeader.size:offset + _eventHeader.size + length].rstrip("\0")
+				offset += _eventHeader.size + length
+				count += 1
+				if mask & IN_Q_OVERFLOW:
+					# events were lost, all files may be changed
+					changed.update(self.files)
+				elif mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+					if wd in self.watches:
+						self.log.printOut("Watch of \"%s\" lost.", self.watches.pop(wd), level = WARN_LEVEL)
+					changed.update(self.files)
+				elif name and wd in self.watches:
+					path = os.path.join(self.watches[wd], name)
+					if path in self.files:
+						changed.add(path)
+		self.eventCount += count
+		if not self.isActive():
+			self.stop()
+		if changed:
+			self.callback(changed)
+		return count
+
+	def _onReadable(self, what):
+		try:
+			self.poll()
+		except:
+			self.log.printOut("XMLConfigWatcher-Error:\n%s", format_exc, level = ERROR_LEVEL)
+			self.stop()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+from threading import Thread, Condition
+from time import time
+from traceback import format_exc
+
+from XMLConfigTools import ERROR_LEVEL, WARN_LEVEL, DEBUG_LEVEL, getGeneralLogger
+
+"""
+Writes snapshots of objects within an own thread, so the main loop isn't blocked by the disk
+
+writeFunc:			function which writes the given snapshot (list of objects)
+[debounceTime]:		seconds to wait for further requests, all requests within this time are
+					merged into one write of the latest snapshot
+[loggerInstance]:	Instance of a General-Logger from System-Plugin
+"""
+class XMLConfigWriter(Thread):
+	def __init__(self, writeFunc, debounceTime = 1.0, loggerInstance = None):
+		Thread.__init__(self, name = "XMLConfigWriter")
+		self.daemon = True
+		self.writeFunc = writeFunc
+		self.debounceTime = debounceTime
+		self.condition = Condition()
+		self.pendingSnapshot = None
+		self.lastRequestTime = 0
+		self.writing = False
+		self.flushRequested = False
+		self.running = True
+		self.requestCount = 0
+		self.writeCount = 0
+
+		self.log = getGeneralLogger(loggerInstance = loggerInstance)
+
+	"""
+	queues the snapshot for writing, an older pending snapshot is replaced
+	"""
+	def requestWrite(self, snapshot):
+		with self.condition:
+			self.pendingSnapshot = snapshot
+			self.lastRequestTime = time()
+			self.requestCount += 1
+			self.condition.notify_all()
+
+	"""
+	returns True if a snapshot is queued or is currently written
+	"""
+	def isPending(self):
+		with self.condition:
+			return self.pendingSnapshot != None or self.writing
+
+	"""
+	writes the pending snapshot without waiting for the debounce-time, and waits until it is written
+		returns False if the timeout (in seconds) was reached before
+	"""
+	def flush(self, timeout = None):
+		with self.condition:
+			endTime = None
+			if timeout != None:
+				endTime = time() + timeout
+			self.flushRequested = True
+			self.condition.notify_all()
+			while self.pendingSnapshot != None or self.writing:
+				if endTime == None:
+					self.condition.wait()
+				else:
+					remaining = endTime - time()
+					if remaining <= 0:
+						return False
+					self.condition.wait(remaining)
+			return True
+
+	"""
+	writes the pending snapshot and ends the thread, e.g. on shutdown
+		returns False if the timeout (in seconds) was reached before
+	"""
+	def stop(self, timeout = None):
+		flushed = self.flush(timeout)
+		with self.condition:
+			self.running = False
+			self.condition.notify_all()
+		self.join(timeout)
+		self.log.printOut("XMLConfigWriter stopped: %d requests, %d writes.", \
+			self.requestCount, self.writeCount, level = DEBUG_LEVEL)
+		return flushed
+
+	def run(self):
+		while True:
+			with self.condition:
+				while self.running and self.pendingSnapshot == None:
+					self.condition.wait()
+				if self.pendingSnapshot == None:
+					return
+				# merge further requests within the debounce-time
+				while self.running and not self.flushRequested:
+					remaining = self.lastRequestTime + self.debounceTime - time()
+					if remaining <= 0:
+						break
+					self.condition.wait(remaining)
+				snapshot = self.pendingSnapshot
+				self.pendingSnapshot = None
+				self.writing = True
+
+			try:
+				self.writeFunc(snapshot)
+			except:
+				self.log.printOut("XMLConfigWriter-Error:\n%s", format_exc, level = ERROR_LEVEL)
+
+			with self.condition:
+				self.writing = False
+				self.writeCount += 1
+				if self.pendingSnapshot == None:
+					self.flushRequested = False
+				self.condition.notify_all()
@@ -1,5 +1,3 @@
-from Components.Language import language
-from Tools.Directories import resolveFilename, SCOPE_PLUGINS
 import os,gettext
  
 PluginLanguageDomain = "xmlConfigTool"
@@ -7,12 +5,27 @@ PluginLanguagePath = "SystemPlugins/xmlConfigTool/locale"
 # Fallback to EN for Code-Strings
 DefaultPluginLang = "EN"
 
+# the translations are bound on the first use of _, so the storage-core can be imported without the components of enigma
+localeInitialized = False
+
 def localeInit():
+    from Components.Language import language
+    from Tools.Directories import resolveFilename, SCOPE_PLUGINS
     lang = language.getLanguage()[:2] # getLanguage returns e.g. "fi_FI" for "language_country"
     os.environ["LANGUAGE"] = lang # Enigma doesn't set this (or LC_ALL, LC_MESSAGES, LANG). gettext needs it!
     gettext.bindtextdomain(PluginLanguageDomain, resolveFilename(SCOPE_PLUGINS, PluginLanguagePath))
  
+def lazyLocaleInit():
+    global localeInitialized
+    if not localeInitialized:
+        localeInitialized = True
+        from Components.Language import language
+        localeInit()
+        language.addCallback(localeInit)
+
 def _(txt):
+    if not localeInitialized:
+        lazyLocaleInit()
     t = gettext.dgettext(PluginLanguageDomain, txt)
     if t == txt:
         t = getDefaultTxt(txt)
@@ -21,11 +34,9 @@ def _(txt):
     return t
 
 def getDefaultTxt(txt):
+    from Components.Language import language
     lang = language.getLanguage()[:2]
     os.environ["LANGUAGE"] = DefaultPluginLang
     t = gettext.dgettext(PluginLanguageDomain, txt)
     os.environ["LANGUAGE"] = lang
     return t
- 
-localeInit()
-language.addCallback(localeInit)
\ No newline at end of file
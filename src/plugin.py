@@ -7,23 +7,45 @@ from traceback import format_exc
 
 from . import _
 
-XMLConfigHelpfile = None
-XMLConfigMainHelp = None
-try:
-	from Plugins.SystemPlugins.MPHelp import registerHelp, XMLHelpReader
-	
-	XMLConfigHelpfile = resolveFilename(SCOPE_PLUGINS, "SystemPlugins/xmlConfigTool") + "/mphelp.xml"
-	reader = XMLHelpReader(XMLConfigHelpfile)
-	XMLConfigMainHelp = registerHelp(*reader)
-except:
-	getGeneralLogger().printOut("Help-Init-Error:\n%s" % str(format_exc()), level = ERROR_LEVEL)
+"""
+Help of the plugin, which is parsed and registered with MPHelp on its first use,
+not at every start of enigma, the registered help is kept afterwards
+	helpFile:	path of the mphelp-file
+"""
+class XMLConfigHelp:
+	def __init__(self, helpFile):
+		self.helpFile = helpFile
+		self.help = None
+		self.failed = False
+
+	"""
+	returns the registered help, or None if MPHelp isn't available
+	"""
+	def getHelp(self):
+		if self.help == None and not self.failed:
+			try:
+				from Plugins.SystemPlugins.MPHelp import registerHelp, XMLHelpReader
+				reader = XMLHelpReader(self.helpFile)
+				self.help = registerHelp(*reader)
+			except:
+				# not tried again at every call
+				self.failed = True
+				getGeneralLogger().printOut("Help-Init-Error:\n%s", format_exc, level = ERROR_LEVEL)
+		return self.help
+
+	def open(self, session):
+		help = self.getHelp()
+		if help:
+			help.open(session)
+
+XMLConfigHelpfile = resolveFilename(SCOPE_PLUGINS, "SystemPlugins/xmlConfigTool") + "/mphelp.xml"
+XMLConfigMainHelp = XMLConfigHelp(XMLConfigHelpfile)
 
 def showMainHelp(session, **kwargs):
 	try:
-		if XMLConfigMainHelp:
-			XMLConfigMainHelp.open(session)
+		XMLConfigMainHelp.open(session)
 	except:
-		getGeneralLogger().printOut("showMainHelp-Error:\n%s" % str(format_exc()), level = ERROR_LEVEL)
+		getGeneralLogger().printOut("showMainHelp-Error:\n%s", format_exc, level = ERROR_LEVEL)
 
 def Plugins(**kwargs):
 	return [